@@ -1,12 +1,17 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from seqtools.counting import symbol_counts
+
 def frequencies(seq):
     total = len(seq)
-    alphabet = set(seq)
-    
+    counts = symbol_counts(seq)
+
     frequencies = {}
-    for symbol in alphabet:
-        count = seq.count(symbol)
-        frequencies[symbol] = count / total   
-    
+    for symbol, count in counts.items():
+        frequencies[symbol] = count / total
+
     return frequencies
 
 S = "ATTTCGCCGATA"
@@ -1,63 +1,134 @@
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 import tkinter as tk
 from tkinter import filedialog, ttk, messagebox
 
-def parse_fasta(filepath):
-    """Read FASTA file and return the sequence as a generator (memory-efficient)."""
-    with open(filepath, "r") as f:
-        next(f)  # skip header
-        for line in f:
-            line = line.strip()
-            if line.startswith(">"):  # start of a new sequence → stop
-                break
-            yield line
+from seqtools.cache import cached
+from seqtools.counting import symbol_counts, to_percentages
+from seqtools.fasta import read_fasta_pieces
+from seqtools.fastq import fastq_stats, is_fastq
+from seqtools.gui import BackgroundTask
+from seqtools.parallel import parallel_symbol_counts
+
+# Files at least this large are counted in byte ranges on all cores
+PARALLEL_MIN_SIZE = 256 * 1024 * 1024
+
+def parse_fasta(filepath, progress=None):
+    """Read FASTA file and yield the first record's sequence piece by piece (memory-efficient)."""
+    first = None
+    for header, piece in read_fasta_pieces(filepath, progress=progress):
+        if first is None:
+            first = header
+        elif header != first:  # start of a new sequence → stop
+            break
+        yield piece.decode("ascii", errors="replace")
 
 def calculate_frequencies(sequence_generator):
-    """Calculate relative frequencies of symbols in a sequence."""
-    counts = {}
-    total = 0
-    for seq_part in sequence_generator:
-        for char in seq_part:
-            counts[char] = counts.get(char, 0) + 1
-            total += 1
-    
-    frequencies = {char: (count / total) * 100 for char, count in counts.items()}
-    return frequencies
+    """Calculate relative frequencies (%) of symbols in a sequence."""
+    counts = symbol_counts(sequence_generator)
+    return to_percentages(counts)
+
+def calculate_file_frequencies(filepath, progress=None):
+    """Frequencies (%) of the first record, using all cores for large files."""
+    if os.path.getsize(filepath) >= PARALLEL_MIN_SIZE:
+        records, _ = parallel_symbol_counts(filepath, progress=progress, first_record_only=True)
+        return to_percentages(records[0][1]) if records else {}
+    return calculate_frequencies(parse_fasta(filepath, progress))
+
+def analyze_file(filepath, task):
+    """Worker-thread entry point: report progress/partial tables through task.
+
+    Results are cached on disk per file, so re-opening a file is instant.
+    """
+    if is_fastq(filepath):
+        return cached(filepath, "fastq_frequencies", {}, lambda: fastq_stats(
+            filepath,
+            progress=task.progress,
+            on_batch=lambda running: task.partial(running.frequencies()),
+        ).frequencies())
+    return cached(filepath, "first_record_frequencies", {},
+                  lambda: calculate_file_frequencies(filepath, progress=task.progress))
+
+def show_frequencies(freqs):
+    # Clear old table
+    for row in tree.get_children():
+        tree.delete(row)
+
+    # Insert new data
+    for symbol, percent in sorted(freqs.items()):
+        tree.insert("", "end", values=(symbol, f"{percent:.4f}%"))
+
+current_task = None
+
+def set_busy(busy):
+    btn.config(state="disabled" if busy else "normal")
+    cancel_btn.config(state="normal" if busy else "disabled")
+    if not busy:
+        progress_bar["value"] = 0
+
+def on_done(freqs):
+    show_frequencies(freqs)
+    set_busy(False)
+    messagebox.showinfo("Success", "Frequencies calculated successfully!")
+
+def on_error(e):
+    set_busy(False)
+    messagebox.showerror("Error", str(e))
+
+def on_cancelled():
+    set_busy(False)
+
+def cancel_analysis():
+    if current_task is not None:
+        current_task.cancel()
 
 def open_file():
+    global current_task
     filepath = filedialog.askopenfilename(
-        filetypes=[("FASTA files", "*.fasta *.fa"), ("All files", "*.*")]
+        filetypes=[
+            ("FASTA files", "*.fasta *.fa *.fna *.gz"),
+            ("FASTQ files", "*.fastq *.fq *.gz"),
+            ("All files", "*.*"),
+        ]
     )
     if not filepath:
         return
 
-    try:
-        sequence_generator = parse_fasta(filepath)
-        freqs = calculate_frequencies(sequence_generator)
-
-        # Clear old table
-        for row in tree.get_children():
-            tree.delete(row)
+    set_busy(True)
+    current_task = BackgroundTask(
+        root,
+        lambda task: analyze_file(filepath, task),
+        on_done=on_done,
+        on_error=on_error,
+        on_progress=lambda fraction: progress_bar.config(value=fraction * 100),
+        on_partial=show_frequencies,
+        on_cancelled=on_cancelled,
+    ).start()
 
-        # Insert new data
-        for symbol, percent in sorted(freqs.items()):
-            tree.insert("", "end", values=(symbol, f"{percent:.4f}%"))
+# GUI Setup (guarded so process-pool workers can import this module)
+if __name__ == "__main__":
+    root = tk.Tk()
+    root.title("FASTA Sequence Analyzer")
+    root.geometry("400x300")
 
-        messagebox.showinfo("Success", "Frequencies calculated successfully!")
+    buttons = tk.Frame(root)
+    buttons.pack(pady=10)
 
-    except Exception as e:
-        messagebox.showerror("Error", str(e))
+    btn = tk.Button(buttons, text="Open FASTA File", command=open_file)
+    btn.pack(side="left", padx=5)
 
-# GUI Setup
-root = tk.Tk()
-root.title("FASTA Sequence Analyzer")
-root.geometry("400x300")
+    cancel_btn = tk.Button(buttons, text="Cancel", command=cancel_analysis, state="disabled")
+    cancel_btn.pack(side="left", padx=5)
 
-btn = tk.Button(root, text="Open FASTA File", command=open_file)
-btn.pack(pady=10)
+    progress_bar = ttk.Progressbar(root, mode="determinate", maximum=100)
+    progress_bar.pack(fill="x", padx=10)
 
-tree = ttk.Treeview(root, columns=("Symbol", "Percentage"), show="headings")
-tree.heading("Symbol", text="Symbol")
-tree.heading("Percentage", text="Percentage")
-tree.pack(expand=True, fill="both")
+    tree = ttk.Treeview(root, columns=("Symbol", "Percentage"), show="headings")
+    tree.heading("Symbol", text="Symbol")
+    tree.heading("Percentage", text="Percentage")
+    tree.pack(expand=True, fill="both")
 
-root.mainloop()
+    root.mainloop()
@@ -1,10 +1,18 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 import pandas as pd
 import matplotlib.pyplot as plt
 
+from seqtools import windows
+from seqtools.plotting import plot_decimated
+
 # --- Input ---------------------------------------------------------
 seq = "CGGACTGATCTATCTAAAAAAAAAAAAAAAAAAAAAAAAAAACGTAGCATCTATCGATCTATCTAGCGATCTATCTACTACG"
 window_len = 30  
 step = 1     
+scales = [30, 100, 1000, 10000]  # extra resolutions saved to the track file
 
 # --- Functions -----------------------------------------------------
 
@@ -18,23 +26,24 @@ def kappa_ic(seq: str) -> float:
     return 100 * sum(v*v for v in freqs.values())
 
 # --- Sliding windows ----------------------------------------------
-result = []
-
-for start in range(0, len(seq) - window_len + 1, step):
-    w = seq[start:start+window_len]
-    cg = cg_percentage(w)
-    ic = kappa_ic(w)
-    center = start + (window_len - 1) / 2
-    
-    result.append({
-        "start": start,
-        "center": center,
-        "window": w,
-        "cg": cg,
-        "ic": ic
+# Prefix sums are built once; every window size below reuses them.
+profile = windows.CumulativeProfile(seq, alphabet="ACGT")
+
+def window_tracks(window_len, step):
+    starts, counts = profile.counts(window_len, step)
+    return pd.DataFrame({
+        "start": starts,
+        "center": starts + (window_len - 1) / 2,
+        "cg": windows.gc_percent(counts, window_len),
+        "ic": windows.kappa_ic(counts, window_len),
     })
 
-df = pd.DataFrame(result)
+df = window_tracks(window_len, step)
+df.insert(2, "window", [seq[s:s + window_len] for s in df["start"]])
+
+multiscale = windows.multiscale_counts(
+    profile, [(w, step) for w in scales if w <= len(seq)])
+windows.write_multiscale_tracks("lab10/dna_pattern_tracks.npz", multiscale)
 
 # Whole sequence expected values
 whole_cg = cg_percentage(seq)         # Should match 29.27 → OK
@@ -49,8 +58,8 @@ df.to_csv("lab10/dna_pattern_windows.csv", index=False)
 
 
 plt.figure(figsize=(12,5))
-plt.plot(df["center"], df["cg"], label="CG%", marker='o')
-plt.plot(df["center"], df["ic"], label="Kappa IC%", marker='s')
+plot_decimated(plt.gca(), df["center"], df["cg"], label="CG%", marker='o')
+plot_decimated(plt.gca(), df["center"], df["ic"], label="Kappa IC%", marker='s')
 plt.title("Sliding Window Pattern (30bp)")
 plt.xlabel("Window Center Position")
 plt.ylabel("Value (%)")
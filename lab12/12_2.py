@@ -1,5 +1,12 @@
+import sys
+from pathlib import Path
+
 import numpy as np
 import matplotlib.pyplot as plt
+from numpy.lib.stride_tricks import sliding_window_view
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from seqtools.encoding import as_codes
 
 seq1 = """GGCATAAGCAGAGGATTTTATAACAATGGAAATAAACCCATATCTACTCATGTTAAACAATGATATAACG
 TCAATGATATCATTGACATACCCATATACTGGGGCACCTCCTATGTCACATGGAACATCGACCAAATACT
@@ -235,6 +242,26 @@ def score_window(window):
     return score
 
 
+# Same scores as score_window for every window at once; the extra zero row
+# makes non-ACGT positions contribute nothing, as in score_window.
+llMatrixN = np.vstack([llMatrix, np.zeros(motif_len)])
+
+# Text is coded by exact ntIndex lookup: unlike as_codes, lowercase and U
+# are left out (row 4), since score_window ignores them too
+ntCodes = np.full(256, 4, dtype=np.uint8)
+for nt, i in ntIndex.items():
+    ntCodes[ord(nt)] = i
+
+
+def score_sequence(genome):
+    if isinstance(genome, str):
+        codes = ntCodes[np.frombuffer(genome.encode("latin-1", errors="replace"), dtype=np.uint8)]
+    else:
+        codes = as_codes(genome)
+    windows = sliding_window_view(codes, motif_len)
+    return llMatrixN[windows, np.arange(motif_len)].sum(axis=1)
+
+
 # INFLUENZA GENOMES
 genomes = {}
 
@@ -254,16 +281,12 @@ fig, axes = plt.subplots(5, 2, figsize=(15, 20))
 axes = axes.flatten()
 
 for idx, (name, genome) in enumerate(genomes.items()):
-    scores = []
-    for i in range(len(genome) - motif_len + 1):
-        window = genome[i : i + motif_len]
-        scores.append(score_window(window))
-    scoresArr = np.array(scores)
+    scoresArr = score_sequence(genome)
     topIndices = scoresArr.argsort()[-5:][::-1]  # top 5 peaks
     topScores = scoresArr[topIndices]
 
     plt.figure(figsize=(12, 4))
-    plt.plot(scores, color="blue", label="PWM Score")
+    plt.plot(scoresArr, color="blue", label="PWM Score")
     plt.scatter(topIndices, topScores, color="red", s=50, label="Top Motifs")
     plt.title(f"{name} – Motif Signal")
     plt.xlabel("Position")
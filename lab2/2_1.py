@@ -1,3 +1,9 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from seqtools.kmers import canonical_kmer, count_kmers_dense, kmer_to_code
+
 S="TACGTGCGCGCGAGCTATCTACTGACTTACGACTAGTGTAGCTGCATCATCGATCGA"
 nucleotides = ['A', 'T', 'C', 'G']
 
@@ -12,10 +18,16 @@ for n1 in nucleotides:
         for n3 in nucleotides:
             trinucleotides.append(n1 + n2 + n3)
 
-def calculate_percentage(seq, combinations):
-    total_positions = len(seq) - len(combinations[0]) + 1
+def calculate_percentage(seq, combinations, canonical=False):
+    # One pass over seq; overlapping occurrences are counted too.
+    # canonical=True counts both strands: each combo gets the count of
+    # min(combo, reverse complement), so a combo and its reverse complement match.
+    k = len(combinations[0])
+    total_positions = len(seq) - k + 1
+    counts = count_kmers_dense(seq, k, canonical)
+    key = canonical_kmer if canonical else (lambda combo: combo)
     return {
-        combo: (seq.count(combo) / total_positions) * 100
+        combo: (counts[kmer_to_code(key(combo))] / total_positions) * 100
         for combo in combinations
     }
 
@@ -1,11 +1,38 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from seqtools.encoding import as_codes, N_CODE
+from seqtools.kmers import (canonical_kmer, count_kmers_dense, count_kmers_sparse, count_kmers_with_n,
+                            dense_to_dict, sparse_to_dict, MAX_DENSE_K, MAX_PACKED_K)
+
 S = "TACGTGCGCGCGAGCTATCTACTGACTTACGACTAGTGTAGCTGCATCATCGATCGA"
 S2= 'ABAA'
 
-def count_kmers(seq, nucleotides):
-    counts = {}
-    for i in range(len(seq) - nucleotides + 1):
-        nucleotide_fragment = seq[i:i+nucleotides]
-        counts[nucleotide_fragment] = counts.get(nucleotide_fragment, 0) + 1
+def count_kmers(seq, nucleotides, canonical=False):
+    if isinstance(seq, str) and seq.strip("ACGT"):
+        # lowercase, U or other symbols: as_codes would fold them onto ACGT/N
+        codes, pure_acgt = None, False
+    else:
+        codes = as_codes(seq)
+        pure_acgt = not (codes == N_CODE).any()
+    if pure_acgt and nucleotides <= MAX_DENSE_K:
+        # rolling 2-bit codes, one vectorized pass into a 4**k table
+        counts = dense_to_dict(count_kmers_dense(codes, nucleotides, canonical), nucleotides)
+    elif pure_acgt and nucleotides <= MAX_PACKED_K:
+        # too many k-mers for a dense table: sorted uint64 codes
+        counts = sparse_to_dict(
+            *count_kmers_sparse(codes, nucleotides, canonical=canonical), nucleotides)
+    elif not isinstance(seq, str):
+        # code arrays with N: N-windows counted as base-5 codes, never decoded whole
+        counts = count_kmers_with_n(codes, nucleotides, canonical)
+    else:
+        counts = {}
+        for i in range(len(seq) - nucleotides + 1):
+            nucleotide_fragment = seq[i:i+nucleotides]
+            if canonical:
+                nucleotide_fragment = canonical_kmer(nucleotide_fragment)
+            counts[nucleotide_fragment] = counts.get(nucleotide_fragment, 0) + 1
     total_positions = len(seq) - nucleotides + 1
     percentages = {nucleotide_fragment: (count / total_positions) * 100 for nucleotide_fragment, count in counts.items()}
     return percentages
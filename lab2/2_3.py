@@ -1,61 +1,130 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 import tkinter as tk
-from tkinter import filedialog, messagebox
+from tkinter import filedialog, messagebox, ttk
 import matplotlib.pyplot as plt
 
+from seqtools.cache import cached
+from seqtools.fasta import read_concatenated
+from seqtools.gui import BackgroundTask
+from seqtools import windows
+from seqtools.plotting import plot_decimated
+
 # --- Function to read FASTA file ---
-def read_fasta(file_path):
-    with open(file_path, "r") as f:
-        lines = f.readlines()
-    # Skip header lines starting with '>'
-    sequence = "".join([line.strip() for line in lines if not line.startswith(">")])
-    return sequence.upper()  # ensure uppercase
+def read_fasta(file_path, progress=None):
+    # All records joined, uppercase
+    return read_concatenated(file_path, progress=progress)
 
 # --- Function to calculate relative frequencies with sliding window ---
-def sliding_window_frequencies(sequence, window_size=30):
-    alphabet = sorted(list(set(sequence)))  # all unique symbols
-    frequencies = {symbol: [] for symbol in alphabet}
-    for i in range(len(sequence) - window_size + 1):
-        window = sequence[i:i+window_size]
-        for symbol in alphabet:
-            freq = window.count(symbol) / window_size
-            frequencies[symbol].append(freq)
+def sliding_window_frequencies(sequence, window_size=30, progress=None, step=1, alphabet=None):
+    # Per-symbol prefix sums: O(n) per symbol for any window size.
+    # Returns {symbol: numpy array of frequencies, one per window}.
+    _, frequencies = windows.sliding_window_frequencies(
+        sequence, window_size, step, alphabet, progress)
     return frequencies
 
+# --- Several window sizes from one set of prefix sums ---
+SCALES = [30, 100, 1000, 10000]
+
+def multiscale_frequencies(sequence, scales=SCALES, alphabet=None, track_file=None):
+    # Returns {(window_size, step): {symbol: frequency array}}; scales are
+    # window sizes or (window_size, step) pairs. track_file saves the raw
+    # counts of every resolution as one .npz (see windows.read_multiscale_tracks).
+    profile = windows.CumulativeProfile(sequence, alphabet)
+    results = windows.multiscale_counts(profile, scales)
+    if track_file is not None:
+        windows.write_multiscale_tracks(track_file, results)
+    return {
+        scale: {symbol: c / scale[0] for symbol, c in counts.items()}
+        for scale, (_, counts) in results.items()
+    }
+
 # --- Function to plot results ---
 def plot_frequencies(frequencies):
     plt.figure(figsize=(12, 6))
+    ax = plt.gca()
     for symbol, values in frequencies.items():
-        plt.plot(values, label=symbol)
+        # Min/max envelope per pixel column, recomputed on zoom
+        plot_decimated(ax, range(len(values)), values, label=symbol)
     plt.xlabel("Window Position")
     plt.ylabel("Relative Frequency")
     plt.title("Sliding Window Relative Frequencies")
     plt.legend()
     plt.show()
 
+# --- Worker: runs off the Tk thread, reports through task ---
+def compute_windows(file_path, task):
+    task.status("Reading sequence...")
+    sequence = read_fasta(file_path, progress=task.progress)
+    if len(sequence) < 30:
+        raise ValueError("Sequence is too short for a sliding window of 30.")
+    task.status("Computing sliding windows...")
+    return sliding_window_frequencies(sequence, 30, progress=task.progress)
+
+def analyze_file(file_path, task):
+    # Cached on disk per file and window size; a hit skips reading entirely
+    return cached(file_path, "sliding_window_frequencies", {"window_size": 30},
+                  lambda: compute_windows(file_path, task))
+
+current_task = None
+
+def set_busy(busy, text="Select a FASTA file to analyze:"):
+    btn.config(state="disabled" if busy else "normal")
+    cancel_btn.config(state="normal" if busy else "disabled")
+    label.config(text=text)
+    if not busy:
+        progress_bar["value"] = 0
+
+def on_done(frequencies):
+    set_busy(False)
+    plot_frequencies(frequencies)  # matplotlib must run on the Tk thread
+
+def on_error(e):
+    set_busy(False)
+    messagebox.showerror("Error", str(e))
+
+def cancel_analysis():
+    if current_task is not None:
+        current_task.cancel()
+
 # --- GUI function to select file and run analysis ---
 def select_file():
-    file_path = filedialog.askopenfilename(filetypes=[("FASTA files", "*.fasta *.fna")])
+    global current_task
+    file_path = filedialog.askopenfilename(filetypes=[("FASTA files", "*.fasta *.fna *.gz")])
     if not file_path:
         return
-    try:
-        sequence = read_fasta(file_path)
-        if len(sequence) < 30:
-            messagebox.showerror("Error", "Sequence is too short for a sliding window of 30.")
-            return
-        frequencies = sliding_window_frequencies(sequence, 30)
-        plot_frequencies(frequencies)
-    except Exception as e:
-        messagebox.showerror("Error", str(e))
+    set_busy(True, "Starting...")
+    current_task = BackgroundTask(
+        root,
+        lambda task: analyze_file(file_path, task),
+        on_done=on_done,
+        on_error=on_error,
+        on_progress=lambda fraction: progress_bar.config(value=fraction * 100),
+        on_status=lambda text: label.config(text=text),
+        on_cancelled=lambda: set_busy(False, "Cancelled. Select a FASTA file to analyze:"),
+    ).start()
 
 # --- GUI Setup ---
-root = tk.Tk()
-root.title("DNA Sliding Window Analyzer")
-root.geometry("400x150")
+if __name__ == "__main__":
+    root = tk.Tk()
+    root.title("DNA Sliding Window Analyzer")
+    root.geometry("400x180")
+
+    label = tk.Label(root, text="Select a FASTA file to analyze:", font=("Arial", 12))
+    label.pack(pady=20)
+
+    progress_bar = ttk.Progressbar(root, mode="determinate", maximum=100)
+    progress_bar.pack(fill="x", padx=10)
+
+    buttons = tk.Frame(root)
+    buttons.pack(pady=10)
 
-label = tk.Label(root, text="Select a FASTA file to analyze:", font=("Arial", 12))
-label.pack(pady=20)
+    btn = tk.Button(buttons, text="Browse FASTA File", command=select_file)
+    btn.pack(side="left", padx=5)
 
-btn = tk.Button(root, text="Browse FASTA File", command=select_file)
-btn.pack(pady=10)
+    cancel_btn = tk.Button(buttons, text="Cancel", command=cancel_analysis, state="disabled")
+    cancel_btn.pack(side="left", padx=5)
 
-root.mainloop()
+    root.mainloop()
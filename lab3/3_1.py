@@ -1,6 +1,14 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 import math
 
-def calculate_tm(seq, method = 1, Na = 0.001):
+from seqtools.tm import NN_NA, nn_tm
+
+def calculate_tm(seq, method = 1, Na = None):
+    if Na is None:
+        Na = NN_NA if method == 3 else 0.001
     seq = seq.upper()
   
     A = seq.count("A")
@@ -14,8 +22,11 @@ def calculate_tm(seq, method = 1, Na = 0.001):
     elif method == 2:
         gc_percent = ((G + C) / length) * 100
         tm = -(81.5 + 16.6 * math.log10(Na) + 0.41 * (gc_percent / 100) - (600 / length))
+    elif method == 3:
+        # Nearest-neighbor (SantaLucia 1998) with Na as the monovalent salt, in M
+        tm = nn_tm(seq, Na)
     else:
-        raise ValueError("Method must be 1 or 2.")
+        raise ValueError("Method must be 1, 2 or 3.")
     return tm
 
 
@@ -23,7 +34,9 @@ if __name__ == "__main__":
     seq = "ATTGCCC"
     tm_value1 = calculate_tm(seq, method=1)
     tm_value2 = calculate_tm(seq, method=2)
+    tm_value3 = calculate_tm(seq, method=3)
     
     print(f"\n tm with method 1: {tm_value1:.2f} C")
     print(f"\n tm with method 2: {tm_value2:.2f} C")
+    print(f"\n tm with method 3: {tm_value3:.2f} C")
 
@@ -1,25 +1,33 @@
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 import matplotlib.pyplot as plt
 import math
+import numpy as np
+
+from seqtools.faidx import IndexedFasta
+from seqtools.fasta import read_first_sequence
+from seqtools.plotting import plot_decimated
+from seqtools.primers import BLOCK_SIZE, iter_primer_candidates, top_primers, write_primer_table
+from seqtools.tm import default_na, nn_tm, tm_profile
+from seqtools.tracks import read_track, track_record, write_fasta_track
+
+# Above this size the Tm track is streamed to disk instead of held in memory
+STREAM_MIN_SIZE = 64 * 1024 * 1024
+# Bases each indexed region advances by; a whole number of primer blocks,
+# so candidates come out in the same order as a scan of the whole record
+REGION_SIZE = 4 * BLOCK_SIZE
+PRIMER_MAX_LEN = 30
 
 def read_fasta(filename):
-    sequence = ""
-    reading = False 
-    with open(filename, "r") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            if line.startswith(">"):
-                if reading:
-                    break
-                reading = True
-                continue
-            if reading:
-                sequence += line
-    return sequence.upper()
-
-
-def calculate_tm(seq, method = 2, Na = 0.0001):
+    return read_first_sequence(filename)
+
+
+def calculate_tm(seq, method = 2, Na = None):
+    # Na defaults to 0.0001 M for method 2 and 0.05 M for method 3
+    Na = default_na(method, Na)
     seq = seq.upper()
   
     A = seq.count("A")
@@ -33,31 +41,78 @@ def calculate_tm(seq, method = 2, Na = 0.0001):
     elif method == 2:
         gc_percent = ((G + C) / length) * 100
         tm = -(81.5 + 16.6 * math.log10(Na) + 0.41 * (gc_percent / 100) - (600 / length))
+    elif method == 3:
+        # Nearest-neighbor (SantaLucia 1998) with Na as the monovalent salt, in M
+        tm = nn_tm(seq, Na)
     else:
-        raise ValueError("Method must be 1 or 2.")
+        raise ValueError("Method must be 1, 2 or 3.")
     return tm
 
 
-def sliding_window_tm(sequence, window_size = 8, Na = 0.001):
-    results = []
-    for i in range(len(sequence) - window_size + 1):
-        window_seq = sequence[i:i+window_size]
-        tm_values = calculate_tm(window_seq)
-        results.append({
-            "start": i + 1,
-            "end": i + window_size,
-            "window": window_seq,
-            "tm": tm_values
-        })
-    return results
+def sliding_window_tm(sequence, window_size = 8, Na = None, method = 2, step = 1, with_windows = False):
+    # Columnar {"start", "end", "tm"} arrays from GC/AT (or, for method 3,
+    # nearest-neighbor dH/dS) prefix sums, same values as calculate_tm on
+    # each window; "window" strings only when asked for.
+    return tm_profile(sequence, window_size, method, Na, step, with_windows)
+
+
+def first_record_regions(fasta, overlap, region_step = REGION_SIZE):
+    # (start, region, owned) for the first record of an IndexedFasta. Regions
+    # advance by region_step bases and overlap by `overlap`; each owns the
+    # windows starting in its first `owned` bases, so every window of up to
+    # overlap + 1 bases is seen exactly once.
+    names = fasta.names()
+    if not names:
+        return
+    length = fasta.length(names[0])
+    for start, region in fasta.iter_regions(names[0], region_step + overlap, overlap=overlap):
+        yield start, region, len(region) if start + len(region) == length else region_step
+
+
+def owned_tm_profile(start, region, owned, window_size = 8, Na = None, method = 2, step = 1):
+    # sliding_window_tm of one region, shifted to record coordinates
+    part = tm_profile(region, window_size, method, Na, step)
+    keep = part["start"] <= owned
+    return {key: part[key][keep] + (start if key != "tm" else 0) for key in ("start", "end", "tm")}
+
+
+def join_profiles(parts, window_size = 8, Na = None, method = 2, step = 1):
+    if not parts:
+        return tm_profile("", window_size, method, Na, step)
+    return {key: np.concatenate([part[key] for part in parts]) for key in ("start", "end", "tm")}
+
+
+def indexed_sliding_window_tm(fasta_file, window_size = 8, Na = None, method = 2, step = 1, region_size = REGION_SIZE):
+    # Same columns as sliding_window_tm for the first record, fetched region
+    # by region through the .fai index instead of reading the whole record;
+    # regions start on the step grid.
+    region_step = step * max(region_size // step, 1)
+    with IndexedFasta(fasta_file) as fasta:
+        parts = [owned_tm_profile(start, region, owned, window_size, Na, method, step)
+                 for start, region, owned in first_record_regions(fasta, window_size - 1, region_step)]
+    return join_profiles(parts, window_size, Na, method, step)
+
+
+def owned_primer_candidates(start, region, owned, **options):
+    # iter_primer_candidates of one region, shifted to record coordinates
+    for batch in iter_primer_candidates(region, **options):
+        keep = batch["start"] <= owned
+        if not keep.any():
+            continue
+        batch = {key: np.asarray(value)[keep] for key, value in batch.items()}
+        batch["start"] += start
+        batch["end"] += start
+        batch["sequence"] = batch["sequence"].tolist()
+        yield batch
 
 
 def plot_tm(results):
-    positions = [r["start"] for r in results]
-    tm_values = [r["tm"] for r in results]
+    positions = results["start"]
+    tm_values = results["tm"]
 
     plt.figure(figsize=(10, 5))
-    plt.plot(positions, tm_values, marker='.', linestyle='-', linewidth=1.5)
+    # Decimated to the axes width and redrawn for the visible range on zoom
+    plot_decimated(plt.gca(), positions, tm_values, marker='.', linestyle='-', linewidth=1.5)
     plt.title("Sliding Window Tm (window size = 8)")
     plt.xlabel("Window start position along sequence")
     plt.ylabel("Melting Temperature (C)")
@@ -65,19 +120,57 @@ def plot_tm(results):
     plt.tight_layout()
     plt.show()
 
+def stream_tm_track(fasta_file, track_file="tm_track.bin", window_size = 8, Na = None, method = 2):
+    # Reads the FASTA in pieces carrying a window_size - 1 overlap and appends
+    # each batch of window rows to track_file, so memory does not grow with
+    # the genome; "start" and "tm" are views of the memory map (no "end"
+    # column, which plot_tm does not need and would cost 8 bytes per window).
+    write_fasta_track(fasta_file, track_file, window_size, method=method, Na=Na)
+    rows, _ = read_track(track_file)
+    first = track_record(rows, 0)
+    return {"start": first["start"], "tm": first["tm"]}
+
+
 def main():
     fasta_file = "mitochondrion.1.1.genomic.fna"
+    if os.path.exists(fasta_file) and os.path.getsize(fasta_file) >= STREAM_MIN_SIZE:
+        plot_tm(stream_tm_track(fasta_file))
+        return
     try:
-        seq = read_fasta(fasta_file)
+        fasta = IndexedFasta(fasta_file)
     except FileNotFoundError:
         print("File not found")
         return
+    except ValueError:
+        fasta = None  # compressed, or line lengths too uneven to index
+
+    # Primer candidates (18-30 nt, filtered and scored) streamed to a table
+    # as each length is scanned, instead of printing every window. With an
+    # index, the Tm profile and the primer search share one pass over
+    # overlapping regions and the record is never loaded whole.
+    table_file = "primer_candidates.tsv"
+    if fasta is None:
+        seq = read_fasta(fasta_file)
+        results = sliding_window_tm(seq)
+        batches = iter_primer_candidates(seq, max_len=PRIMER_MAX_LEN)
+    else:
+        parts = []
+
+        def region_batches():
+            with fasta:
+                for start, region, owned in first_record_regions(fasta, PRIMER_MAX_LEN - 1):
+                    parts.append(owned_tm_profile(start, region, owned))
+                    yield from owned_primer_candidates(start, region, owned, max_len=PRIMER_MAX_LEN)
+
+        batches = region_batches()
+    with open(table_file, "w") as f:
+        top = top_primers(write_primer_table(batches, f), 10)
+    if fasta is not None:
+        results = join_profiles(parts)
 
-    results = sliding_window_tm(seq)
-    
-    print("\nSliding Window tm Results:")
-    for r in results:
-        print(f"{r['start']:>4}-{r['end']:>4} | {r['window']} | tm={r['tm']:.5f} C")
+    print(f"\nPrimer candidates written to {table_file}. Best {len(top['score'])}:")
+    for start, end, tm, gc, sequence in zip(top["start"], top["end"], top["tm"], top["gc"], top["sequence"]):
+        print(f"{start:>6}-{end:>6} | {sequence:<30} | tm={tm:.2f} C | GC={gc:.1f}%")
 
     plot_tm(results)
 
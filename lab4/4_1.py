@@ -1,39 +1,30 @@
-GENETIC_CODE = {
-    'UUU': 'Phe', 'UUC': 'Phe', 'UUA': 'Leu', 'UUG': 'Leu',
-    'UCU': 'Ser', 'UCC': 'Ser', 'UCA': 'Ser', 'UCG': 'Ser',
-    'UAU': 'Tyr', 'UAC': 'Tyr', 'UAA': 'Stop', 'UAG': 'Stop',
-    'UGU': 'Cys', 'UGC': 'Cys', 'UGA': 'Stop', 'UGG': 'Trp',
-    'CUU': 'Leu', 'CUC': 'Leu', 'CUA': 'Leu', 'CUG': 'Leu',
-    'CCU': 'Pro', 'CCC': 'Pro', 'CCA': 'Pro', 'CCG': 'Pro',
-    'CAU': 'His', 'CAC': 'His', 'CAA': 'Gln', 'CAG': 'Gln',
-    'CGU': 'Arg', 'CGC': 'Arg', 'CGA': 'Arg', 'CGG': 'Arg',
-    'AUU': 'Ile', 'AUC': 'Ile', 'AUA': 'Ile', 'AUG': 'Met',
-    'ACU': 'Thr', 'ACC': 'Thr', 'ACA': 'Thr', 'ACG': 'Thr',
-    'AAU': 'Asn', 'AAC': 'Asn', 'AAA': 'Lys', 'AAG': 'Lys',
-    'AGU': 'Ser', 'AGC': 'Ser', 'AGA': 'Arg', 'AGG': 'Arg',
-    'GUU': 'Val', 'GUC': 'Val', 'GUA': 'Val', 'GUG': 'Val',
-    'GCU': 'Ala', 'GCC': 'Ala', 'GCA': 'Ala', 'GCG': 'Ala',
-    'GAU': 'Asp', 'GAC': 'Asp', 'GAA': 'Glu', 'GAG': 'Glu',
-    'GGU': 'Gly', 'GGC': 'Gly', 'GGA': 'Gly', 'GGG': 'Gly'
-}
+import sys
+from pathlib import Path
 
-def convert(seq):
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from seqtools.translate import to_three_letter, translate, write_protein_fasta
+
+def convert(seq, table=1):
     seq = seq.upper()
     start = seq.find("AUG")      
     if start == -1:
         return ""                 
     
-    aminoAcidSeq = []
-    for i in range(start, len(seq), 3):
-        codon = seq[i:i+3]
-        if len(codon) < 3:
-            break                
-        aa = GENETIC_CODE.get(codon, "?")
-        if aa == "*":
-            break                
-        aminoAcidSeq.append(aa)
-    return "".join(aminoAcidSeq)
+    # Whole reading frame through the 64-entry lookup, stopping before the
+    # first stop codon (the old loop compared against "*" while the table
+    # said "Stop", so it never stopped)
+    protein = translate(seq[start:], table, to_stop=True)
+    return to_three_letter(protein)
+
+def translate_fasta(in_path, out_path, mode="orfs", table=1):
+    # Protein FASTA with one-letter codes, written record by record so large
+    # assemblies never sit in memory; mode "frames" writes all six frames
+    return write_protein_fasta(in_path, out_path, mode, table)
 
 seq = "AGUCAGUUUCAUGUUGCCAUGCUAACUUCAUACUGUGG"
 print(convert(seq))
 
+# python 4_1.py genome.fna proteins.faa
+if len(sys.argv) == 3:
+    print(f"{translate_fasta(sys.argv[1], sys.argv[2])} proteins written to {sys.argv[2]}")
+
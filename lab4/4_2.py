@@ -1,5 +1,14 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 import matplotlib.pyplot as plt
-from collections import Counter
+import numpy as np
+
+from seqtools.encoding import BASES
+from seqtools.codon_usage import (amino_acid_counts, cai, codon_usage_matrix,
+                                  relative_adaptiveness, write_usage_matrix)
+from seqtools.translate import THREE_LETTER
 
 GENETIC_CODE = {
     'UUU': 'Phe', 'UUC': 'Phe', 'UUA': 'Leu', 'UUG': 'Leu',
@@ -20,33 +29,25 @@ GENETIC_CODE = {
     'GGU': 'Gly', 'GGC': 'Gly', 'GGA': 'Gly', 'GGG': 'Gly'
 }
 
-def parse_fasta(filename):
-    sequence = ''
-    with open(filename, 'r') as f:
-        for line in f:
-            if not line.startswith('>'):
-                sequence += line.strip().upper()
-    return sequence.replace('T', 'U')
+def codon_name(index):
+    # Codon index (16*b1 + 4*b2 + b3) back to an RNA triplet such as 'AUG'
+    return "".join(BASES[(index >> shift) & 3] for shift in (4, 2, 0)).replace("T", "U")
 
-def extract_codons_from_aug(seq):
-    codons = []
-    for i in range(len(seq) - 2):
-        if seq[i:i+3] == 'AUG':
-            for j in range(i, len(seq) - 2, 3):
-                codon = seq[j:j+3]
-                if len(codon) == 3:
-                    codons.append(codon)
-                    if codon in ['UAA', 'UAG', 'UGA']:
-                        break
-    return codons
+# ORFs as the assignment defines them: forward strand, from AUG to the
+# stop codon (included) or to the end of the sequence
+LAB_ORFS = {"min_length": 0, "strands": (1,), "include_partial": True}
 
-def analyze_codons(codons):
-    codon_freq = Counter(codons)
-    top10_codons = codon_freq.most_common(10)
+LABELS = {'covid19_genome.fna': 'COVID-19', 'influenza_genome.fna': 'Influenza'}
+COLORS = ['#3B82F6', '#9333EA', '#10B981', '#F59E0B']
+
+def analyze_codons(codon_freq):
+    # codon_freq: 64 codon counts (a row of the codon usage matrix)
+    top10 = np.argsort(-codon_freq, kind="stable")[:10]
+    top10_codons = [(codon_name(i), int(codon_freq[i])) for i in top10 if codon_freq[i]]
     
-    aa_list = [GENETIC_CODE.get(codon, 'Unknown') for codon in codons]
-    aa_freq = Counter(aa_list)
-    top3_aa = aa_freq.most_common(3)
+    aa_freq, letters = amino_acid_counts(codon_freq)
+    top3_aa = [(THREE_LETTER[letters[a]], int(aa_freq[a]))
+               for a in np.argsort(-aa_freq, kind="stable")[:3] if aa_freq[a]]
     
     return top10_codons, top3_aa
 
@@ -65,64 +66,64 @@ def plot_codons(top10, title, color):
     plt.show()
 
 def main():
-    covid_file = 'covid19_genome.fna'
-    flu_file = 'influenza_genome.fna'
-    
-    covid_rna = parse_fasta(covid_file)
-    flu_rna = parse_fasta(flu_file)
+    # Any number of genomes can be given on the command line; each one gets
+    # its top 10 and top 3, and the first two are compared
+    genome_files = sys.argv[1:] or ['covid19_genome.fna', 'influenza_genome.fna']
     
-    print("Extracting codons from AUG...")
-    covid_codons = extract_codons_from_aug(covid_rna)
-    flu_codons = extract_codons_from_aug(flu_rna)
+    print("Counting codons in ORFs from AUG...")
+    names, usage = codon_usage_matrix(genome_files, **LAB_ORFS)
+    write_usage_matrix("codon_usage.tsv", names, usage)
+    labels = [LABELS.get(name, name) for name in names]
     
-    print(f"COVID-19: {len(covid_codons)} codons analyzed")
-    print(f"Influenza: {len(flu_codons)} codons analyzed\n")
+    for label, counts in zip(labels, usage):
+        print(f"{label}: {counts.sum()} codons analyzed")
+    print()
     
-    covid_top10, covid_top3_aa = analyze_codons(covid_codons)
-    flu_top10, flu_top3_aa = analyze_codons(flu_codons)
-    
-    # a) COVID-19 top 10 chart
-    print("=" * 50)
-    print("a) COVID-19 Top 10 Most Frequent Codons:")
-    for i, (codon, count) in enumerate(covid_top10, 1):
-        aa = GENETIC_CODE.get(codon, 'Unknown')
-        print(f"{i:2}. {codon} ({aa}): {count}")
-    plot_codons(covid_top10, "a) COVID-19 Top 10 Most Frequent Codons", '#3B82F6')
-    
-    # b) Influenza top 10 chart
-    print("\n" + "=" * 50)
-    print("b) Influenza Top 10 Most Frequent Codons:")
-    for i, (codon, count) in enumerate(flu_top10, 1):
-        aa = GENETIC_CODE.get(codon, 'Unknown')
-        print(f"{i:2}. {codon} ({aa}): {count}")
-    plot_codons(flu_top10, "b) Influenza Top 10 Most Frequent Codons", '#9333EA')
+    # a), b) Top 10 chart of each genome
+    for n, (label, counts) in enumerate(zip(labels, usage)):
+        top10, _ = analyze_codons(counts)
+        title = f"{label} Top 10 Most Frequent Codons"
+        print("=" * 50)
+        print(title + ":")
+        for i, (codon, count) in enumerate(top10, 1):
+            aa = GENETIC_CODE.get(codon, 'Unknown')
+            print(f"{i:2}. {codon} ({aa}): {count}")
+        plot_codons(top10, title, COLORS[n % len(COLORS)])
+        print()
     
     # c) Compare common codons
-    print("\n" + "=" * 50)
-    print("c) Common Codons in Top 10 of Both Genomes:")
-    covid_set = {c[0] for c in covid_top10}
-    flu_set = {c[0] for c in flu_top10}
-    common = covid_set & flu_set
-    
-    if common:
-        for codon in sorted(common):
-            covid_count = next(c[1] for c in covid_top10 if c[0] == codon)
-            flu_count = next(c[1] for c in flu_top10 if c[0] == codon)
-            aa = GENETIC_CODE.get(codon, 'Unknown')
-            print(f"  {codon} ({aa}) - COVID: {covid_count}, Flu: {flu_count}")
-    else:
-        print("  No common codons found")
+    if len(usage) >= 2:
+        print("=" * 50)
+        print(f"c) Common Codons in Top 10 of {labels[0]} and {labels[1]}:")
+        top_n = 10
+        common = np.intersect1d(np.argsort(-usage[0], kind="stable")[:top_n],
+                                np.argsort(-usage[1], kind="stable")[:top_n])
+        
+        if len(common):
+            for i in common:
+                codon = codon_name(i)
+                aa = GENETIC_CODE.get(codon, 'Unknown')
+                print(f"  {codon} ({aa}) - {labels[0]}: {usage[0][i]}, {labels[1]}: {usage[1][i]}")
+        else:
+            print("  No common codons found")
+        print()
     
     # d) Top 3 amino acids
-    print("\n" + "=" * 50)
+    print("=" * 50)
     print("d) Top 3 Amino Acids for Each Genome:")
-    print("\nCOVID-19:")
-    for i, (aa, count) in enumerate(covid_top3_aa, 1):
-        print(f"  {i}. {aa}: {count} occurrences")
+    for label, counts in zip(labels, usage):
+        _, top3_aa = analyze_codons(counts)
+        print(f"\n{label}:")
+        for i, (aa, count) in enumerate(top3_aa, 1):
+            print(f"  {i}. {aa}: {count} occurrences")
     
-    print("\nInfluenza:")
-    for i, (aa, count) in enumerate(flu_top3_aa, 1):
-        print(f"  {i}. {aa}: {count} occurrences")
+    # e) CAI of every genome against the pooled codon usage
+    print("\n" + "=" * 50)
+    print("e) Codon Adaptation Index (reference: all genomes pooled):")
+    scores = cai(usage, relative_adaptiveness(usage))
+    for name, score in zip(names, scores):
+        print(f"  {name}: {score:.3f}")
+    print("Codon usage matrix written to codon_usage.tsv")
     print("=" * 50)
 
 if __name__ == "__main__":
@@ -1,4 +1,9 @@
 import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from seqtools.assembly import assemble
 
 seq = """ATTAAAGGTTTATACCTTCCCAGGTAACAAACCAACCAACTTTCGATCTCTTGTAGATCTGTTCTCTAAA
 CGAACTTTAAAATCTGTGTGGCTGTCACTCGGCTGCATGCTTAGTGCACTCACGCAGTATAATTAATAAC
@@ -66,4 +71,14 @@ print(f"Reconstructed sequence length: {len(reconstructed_sequence)} nucleotides
 print(f"Original sequence length: {len(seq)} nucleotides")
 
 print(f"\nOriginal: {seq}")
-print(f"\nReconstructed: {reconstructed_sequence}")
\ No newline at end of file
+print(f"\nReconstructed: {reconstructed_sequence}")
+
+# De novo path: the reads alone, shuffled and without start positions.
+# Overlaps come from a minimizer index (only reads sharing seeds are
+# compared) and contigs from the best-overlap graph.
+reads = [sample for _, sample in samples]
+random.shuffle(reads)
+contigs = assemble(reads)
+
+print(f"\nDe novo assembly: {len(contigs)} contig(s), longest {len(contigs[0]) if contigs else 0} nucleotides")
+print(f"Longest contig found in the original: {bool(contigs) and contigs[0] in seq}")
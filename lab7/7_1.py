@@ -1,4 +1,10 @@
 from collections import defaultdict
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from seqtools.encoding import as_codes, N_CODE
+from seqtools.kmers import canonical_kmer, count_kmers_ordered, count_kmers_with_n
 
 seq = """ATTAAAGGTTTATACCTTCCCAGGTAACAAACCAACCAACTTTCGATCTCTTGTAGATCTGTTCTCTAAA
 CGAACTTTAAAATCTGTGTGGCTGTCACTCGGCTGCATGCTTAGTGCACTCACGCAGTATAATTAATAAC
@@ -27,13 +33,31 @@ ACCTTCTTGAAATACTCCAAAAAGAGAAAGTCAACATCAATATTGTTGGTGACTTTAAACTTAATGAAGA
 GATCGCCATTATTTTGGCATCTTTTTCTGCTTCCACAAGTGCTTTTGTGGAAACTGTGAAAGGTTTGGAT
 TATAAAGCATTCAAACAAATTGTTGAATCCTGTGGTAATTTTAAAGTTACAAAAGGAAAAGCTAAAAAAG""".replace('\n', '')
 
-def find_repeats(seq, min_len=6, max_len=10):
+def find_repeats(seq, min_len=6, max_len=10, canonical=False):
+    codes = as_codes(seq)
+    if not (codes == N_CODE).any():
+        # pure ACGT: packed uint64 k-mer codes instead of a dict of substrings,
+        # kept in first-occurrence order like the loop below
+        result = {}
+        for k in range(min_len, max_len + 1):
+            result.update(count_kmers_ordered(codes, k, canonical, min_count=2))
+        return result
+    if not isinstance(seq, str):
+        # code arrays with N: N-windows counted as base-5 codes, never decoded whole
+        result = {}
+        for k in range(min_len, max_len + 1):
+            counts = count_kmers_with_n(codes, k, canonical)
+            result.update((sub, c) for sub, c in counts.items() if c > 1)
+        return result
+
     repeats = defaultdict(int)
     n = len(seq)
 
     for k in range(min_len, max_len + 1):
         for i in range(n - k + 1):
             subseq = seq[i:i+k]
+            if canonical:
+                subseq = canonical_kmer(subseq)
             repeats[subseq] += 1
 
     # Keep only those appearing more than once
@@ -1,5 +1,12 @@
 import matplotlib.pyplot as plt
 from collections import defaultdict
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from seqtools.encoding import as_codes, N_CODE
+from seqtools.kmers import canonical_kmer, count_kmers_ordered, count_kmers_with_n
+from seqtools.sketch import HeavyHitters
 
 seq1 = """GGCATAAGCAGAGGATTTTATAACAATGGAAATAAACCCATATCTACTCATGTTAAACAATGATATAACG
 TCAATGATATCATTGACATACCCATATACTGGGGCACCTCCTATGTCACATGGAACATCGACCAAATACT
@@ -278,15 +285,50 @@ AAAAA""".replace('\n', '')
 
 genomes = [seq1, seq2, seq3, seq4, seq5, seq6, seq7, seq8, seq9, seq10]
 
-def find_repeats(seq, min_len=6, max_len=10):
+def find_repeats(seq, min_len=6, max_len=10, canonical=False):
+    codes = as_codes(seq)
+    if not (codes == N_CODE).any():
+        # pure ACGT: packed uint64 k-mer codes instead of a dict of substrings,
+        # kept in first-occurrence order like the loop below
+        result = {}
+        for k in range(min_len, max_len + 1):
+            result.update(count_kmers_ordered(codes, k, canonical, min_count=2))
+        return result
+    if not isinstance(seq, str):
+        # code arrays with N: N-windows counted as base-5 codes, never decoded whole
+        result = {}
+        for k in range(min_len, max_len + 1):
+            counts = count_kmers_with_n(codes, k, canonical)
+            result.update((sub, c) for sub, c in counts.items() if c > 1)
+        return result
+
     counts = defaultdict(int)
     n = len(seq)
     for k in range(min_len, max_len + 1):
         for i in range(n - k + 1):
             sub = seq[i:i+k]
+            if canonical:
+                sub = canonical_kmer(sub)
             counts[sub] += 1
     return {sub: c for sub, c in counts.items() if c > 1}
 
+def stream_top_repeats(sequences, min_len=6, max_len=10, top_n=10, canonical=False):
+    """Top repeats over an iterable of sequences (or FASTA records) in fixed memory.
+
+    Counts are Count-Min estimates (never below the true count); use this
+    instead of find_repeats when the input does not fit in RAM.
+    """
+    hitters = {k: HeavyHitters(k, capacity=max(100 * top_n, 1000), canonical=canonical)
+               for k in range(min_len, max_len + 1)}
+    for seq in sequences:
+        for hh in hitters.values():
+            hh.update(seq)
+    ranked = []
+    for hh in hitters.values():
+        ranked.extend((kmer, estimate) for kmer, estimate, _ in hh.top(top_n))
+    ranked.sort(key=lambda x: x[1], reverse=True)
+    return dict(ranked[:top_n])
+
 def plot_top_repeats(seq_id, repeats, top_n=10):
     if not repeats:
         print(f"No repeats found in genome {seq_id}")
@@ -1,6 +1,13 @@
 import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import numpy as np
+
+from seqtools.encoding import NucleotideArray, as_codes
+from seqtools.fasta import read_concatenated
+from seqtools.kmers import base5_codes
+
 def reverse_complement(seq):
     """Return reverse complement of DNA sequence"""
     complement = {'A': 'T', 'T': 'A', 'G': 'C', 'C': 'G'}
@@ -8,38 +15,69 @@ def reverse_complement(seq):
 
 def read_fasta(filename):
     """Read FASTA file and return sequence as single string"""
-    seq = []
-    with open(filename, 'r') as f:
-        for line in f:
-            line = line.strip()
-            if not line.startswith('>'):
-                seq.append(line.upper())
-    return ''.join(seq)
+    return read_concatenated(filename)
+
+_ACGTN = str.maketrans("", "", "ACGTN")
+
+def inverted_repeat_pairs(codes, size):
+    """(i, j) arrays of every window pair with window j the reverse complement
+    of window i and j >= i + size, ordered by i then j.
+
+    Windows are base-5 codes (N pairs with N, as reverse_complement leaves
+    it), sorted once; each left window finds its downstream matches with
+    two binary searches instead of a scan of the rest of the sequence.
+    """
+    forward, rc = base5_codes(codes, size, reverse_complement=True)
+    n = len(forward)
+    uniques, ids = np.unique(forward, return_inverse=True)
+    # one sortable key per window: (code rank, position)
+    keys = np.sort(ids.astype(np.int64) * (n + 1) + np.arange(n))
+    rank = np.searchsorted(uniques, rc).clip(max=len(uniques) - 1)
+    found = uniques[rank] == rc
+    first = np.searchsorted(keys, rank * (n + 1) + np.arange(n) + size)
+    last = np.searchsorted(keys, (rank + 1) * (n + 1))
+    counts = np.where(found, last - first, 0).clip(min=0)
+    i = np.repeat(np.arange(n), counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    j = keys[np.repeat(first, counts) + offsets] % (n + 1)
+    return i, j
+
+def scan_inverted_repeat_pairs(sequence, size):
+    """(i, j) pairs found by comparing the windows as strings; every symbol
+    other than ACGT only pairs with itself (reverse_complement keeps it)."""
+    pairs = []
+    for i in range(len(sequence) - size + 1):
+        left_rc = reverse_complement(sequence[i:i + size])
+        for j in range(i + size, len(sequence) - size + 1):
+            if sequence[j:j + size] == left_rc:
+                pairs.append((i, j))
+    return [p[0] for p in pairs], [p[1] for p in pairs]
 
 def find_inverted_repeats(sequence, min_size=4, max_size=6):
     """Find all inverted repeats in sequence"""
+    # as_codes folds every other symbol (IUPAC, lowercase) into N, so the
+    # code path is only exact for uppercase ACGTN text
+    exact_codes = isinstance(sequence, NucleotideArray) or not sequence.translate(_ACGTN)
+    codes = as_codes(sequence) if exact_codes else None
     repeats = []
-    seq_len = len(sequence)
     
     for size in range(min_size, max_size + 1):
-        for i in range(seq_len - size + 1):
-            left_ir = sequence[i:i + size]
-            left_rc = reverse_complement(left_ir)
-            
-            # Search for matching inverted repeat downstream
-            for j in range(i + size, seq_len - size + 1):
-                right_ir = sequence[j:j + size]
-                
-                if left_rc == right_ir:
-                    repeats.append({
-                        'left_start': i,
-                        'left_end': i + size - 1,
-                        'right_start': j,
-                        'right_end': j + size - 1,
-                        'ir_size': size,
-                        'spacer_size': j - (i + size),
-                        'total_length': (j + size) - i
-                    })
+        if len(sequence) < size:
+            break
+        if exact_codes:
+            pairs = (a.tolist() for a in inverted_repeat_pairs(codes, size))
+        else:
+            pairs = scan_inverted_repeat_pairs(sequence, size)
+        for i, j in zip(*pairs):
+            repeats.append({
+                'left_start': i,
+                'left_end': i + size - 1,
+                'right_start': j,
+                'right_end': j + size - 1,
+                'ir_size': size,
+                'spacer_size': j - (i + size),
+                'total_length': (j + size) - i
+            })
     
     return repeats
 
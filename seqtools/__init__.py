@@ -0,0 +1 @@
+"""Shared sequence utilities used by the lab scripts."""
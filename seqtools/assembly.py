@@ -0,0 +1,141 @@
+"""Overlap assembly of short reads seeded by a minimizer index."""
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .encoding import N_CODE, encode
+from .kmers import rolling_codes
+from .sketch import splitmix64
+
+_NO_KMER = np.uint64(2 ** 64 - 1)
+
+
+def minimizers(reads, k=15, w=10):
+    """Return (hashes, read_ids, positions) of the (w, k) minimizers of every read.
+
+    All reads are encoded as one N-separated array, so k-mer codes, hashes
+    and the sliding-window minimum are a few array operations over all
+    reads at once. Each window of w consecutive k-mers contributes its
+    smallest hash; repeated picks are kept once.
+    """
+    starts = np.cumsum([0] + [len(r) + 1 for r in reads])[:-1]
+    codes = encode("N".join(reads))
+    if len(codes) < k + w - 1:
+        empty = np.zeros(0, dtype=np.int64)
+        return np.zeros(0, dtype=np.uint64), empty, empty
+    forward, _ = rolling_codes(codes, k, reverse_complement=False)
+    # a full 64-bit mix, so minimizers are not biased towards low-code k-mers
+    hashes = splitmix64(forward, np.uint64(0))
+    bad = np.concatenate([[0], np.cumsum(codes == N_CODE)])
+    hashes[(bad[k:] - bad[:-k]) > 0] = _NO_KMER
+    windows = sliding_window_view(hashes, w)
+    picks = np.unique(windows.argmin(axis=1) + np.arange(len(windows)))
+    picks = picks[hashes[picks] != _NO_KMER]
+    read_ids = np.searchsorted(starts, picks, side="right") - 1
+    return hashes[picks], read_ids, picks - starts[read_ids]
+
+
+def candidate_overlaps(hashes, read_ids, positions, min_shared=2, max_occurrences=1000):
+    """Read pairs that share minimizers on a consistent diagonal.
+
+    Returns arrays (left, right, offset, votes): right starts offset bases
+    into left. Only reads sharing a seed are ever paired, and seeds seen
+    more than max_occurrences times (repeats) are ignored.
+    """
+    order = np.argsort(hashes, kind="stable")
+    hashes, read_ids, positions = hashes[order], read_ids[order], positions[order]
+    _, sizes = np.unique(hashes, return_counts=True)
+    keep = np.repeat(sizes <= max_occurrences, sizes)
+    hashes, read_ids, positions = hashes[keep], read_ids[keep], positions[keep]
+    left, right, offset = [], [], []
+    for d in range(1, max_occurrences):
+        same = np.flatnonzero(hashes[:-d] == hashes[d:])
+        if len(same) == 0:
+            break
+        a, b = same, same + d
+        diag = positions[a] - positions[b]
+        swap = diag < 0
+        left.append(np.where(swap, read_ids[b], read_ids[a]))
+        right.append(np.where(swap, read_ids[a], read_ids[b]))
+        offset.append(np.abs(diag))
+    if not left:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, empty, empty
+    left, right, offset = np.concatenate(left), np.concatenate(right), np.concatenate(offset)
+    distinct = left != right
+    # one int64 key per (left, right, offset) so np.unique stays one-dimensional
+    span = int(offset.max()) + 1
+    keys = (left[distinct] * (int(read_ids.max()) + 1) + right[distinct]) * span + offset[distinct]
+    keys, votes = np.unique(keys, return_counts=True)
+    keys, votes = keys[votes >= min_shared], votes[votes >= min_shared]
+    pair, offset = np.divmod(keys, span)
+    left, right = np.divmod(pair, int(read_ids.max()) + 1)
+    return left, right, offset, votes
+
+
+def _verify(reads, left, right, offset, min_overlap):
+    """Exact check of each candidate: (contained flags, list of (a, b, overlap))."""
+    contained = np.zeros(len(reads), dtype=bool)
+    edges = []
+    for a, b, o in zip(left.tolist(), right.tolist(), offset.tolist()):
+        ra, rb = reads[a], reads[b]
+        if o + len(rb) <= len(ra):
+            if ra[o:o + len(rb)] == rb:
+                contained[b] = True
+        elif o == 0 and len(ra) <= len(rb):
+            if rb[:len(ra)] == ra:
+                contained[a] = True
+        elif len(ra) - o >= min_overlap and ra[o:] == rb[:len(ra) - o]:
+            edges.append((a, b, len(ra) - o))
+    return contained, edges
+
+
+def layout(reads, contained, edges):
+    """Join reads into contigs along the best-overlap graph.
+
+    Among reads not contained in another, each read keeps its longest
+    outgoing and incoming overlap; an edge is used when it is the best for
+    both ends, which leaves simple chains that are spelled out as contigs.
+    """
+    best_out, best_in = {}, {}
+    for a, b, length in edges:
+        if contained[a] or contained[b]:
+            continue
+        if length > best_out.get(a, (None, -1))[1]:
+            best_out[a] = (b, length)
+        if length > best_in.get(b, (None, -1))[1]:
+            best_in[b] = (a, length)
+    nxt = {a: (b, length) for a, (b, length) in best_out.items() if best_in[b][0] == a}
+    has_prev = {b for b, _ in nxt.values()}
+    nodes = [i for i in range(len(reads)) if not contained[i]]
+    heads = [i for i in nodes if i not in has_prev]
+    seen = set()
+    contigs = []
+    for start in heads + nodes:  # leftover nodes belong to cycles
+        if start in seen:
+            continue
+        parts = [reads[start]]
+        seen.add(start)
+        node = start
+        while node in nxt and nxt[node][0] not in seen:
+            node, length = nxt[node]
+            parts.append(reads[node][length:])
+            seen.add(node)
+        contigs.append("".join(parts))
+    return sorted(contigs, key=len, reverse=True)
+
+
+def assemble(reads, k=15, w=10, min_overlap=30, min_shared=2, max_occurrences=1000):
+    """Assemble reads without coordinates into contigs, longest first.
+
+    Reads are indexed by (w, k) minimizers, overlaps are only tested between
+    reads that share seeds (never all pairs), verified exactly, and laid out
+    on the best-overlap graph. Reads are taken to be on one strand, as the
+    lab samples are, and error-free overlaps are required.
+    """
+    reads = list(dict.fromkeys(r.upper() for r in reads if r))
+    hashes, read_ids, positions = minimizers(reads, k, w)
+    left, right, offset, _ = candidate_overlaps(hashes, read_ids, positions,
+                                                min_shared, max_occurrences)
+    contained, edges = _verify(reads, left, right, offset, min_overlap)
+    return layout(reads, contained, edges)
@@ -0,0 +1,125 @@
+"""On-disk LRU cache for per-file analysis results."""
+
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+
+CACHE_DIR = os.environ.get(
+    "SEQTOOLS_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "seqtools")
+)
+MAX_CACHE_BYTES = 512 * 1024 * 1024
+SAMPLE_SIZE = 1 << 20  # bytes hashed from the start, middle and end of a file
+
+
+def content_hash(filepath, sample_size=SAMPLE_SIZE):
+    """Hash the size plus the first, middle and last sample_size bytes.
+
+    Reading three samples keeps a cache lookup fast on multi-GB files while
+    still catching files that were rewritten with the same size and mtime.
+    """
+    size = os.path.getsize(filepath)
+    h = hashlib.blake2b(str(size).encode(), digest_size=16)
+    with open(filepath, "rb") as f:
+        if size <= 3 * sample_size:
+            h.update(f.read())
+        else:
+            for offset in (0, (size - sample_size) // 2, size - sample_size):
+                f.seek(offset)
+                h.update(f.read(sample_size))
+    return h.hexdigest()
+
+
+def cache_key(filepath, analysis, params=None):
+    """Key built from file identity (path, size, mtime, content) and analysis parameters."""
+    st = os.stat(filepath)
+    identity = [
+        os.path.abspath(filepath),
+        st.st_size,
+        st.st_mtime_ns,
+        content_hash(filepath),
+        analysis,
+        params or {},
+    ]
+    return hashlib.blake2b(
+        json.dumps(identity, sort_keys=True, default=str).encode(), digest_size=20
+    ).hexdigest()
+
+
+class ResultCache:
+    """Pickled results in one directory, evicted least-recently-used first.
+
+    Each hit refreshes the entry's mtime, which is what eviction sorts on.
+    """
+
+    def __init__(self, directory=CACHE_DIR, max_bytes=MAX_CACHE_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".pkl")
+
+    def get(self, key):
+        """Return (True, value) on a hit, (False, None) on a miss."""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return False, None
+        os.utime(path)
+        return True, value
+
+    def put(self, key, value):
+        """Store value; returns False (and stores nothing) if it exceeds max_bytes."""
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            size = f.tell()
+        if size > self.max_bytes:
+            os.remove(tmp)
+            return False
+        os.replace(tmp, self._path(key))
+        self.evict(keep=key)
+        return True
+
+    def evict(self, keep=None):
+        """Delete least-recently-used entries until the cache fits max_bytes.
+
+        The entry for key keep (the one just stored) is never deleted.
+        """
+        entries = []
+        kept = 0
+        for name in os.listdir(self.directory):
+            if name.endswith(".pkl"):
+                st = os.stat(os.path.join(self.directory, name))
+                if name == f"{keep}.pkl":
+                    kept = st.st_size
+                else:
+                    entries.append((st.st_mtime, st.st_size, name))
+        total = kept + sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            os.remove(os.path.join(self.directory, name))
+            total -= size
+
+    def clear(self):
+        if os.path.isdir(self.directory):
+            for name in os.listdir(self.directory):
+                if name.endswith(".pkl"):
+                    os.remove(os.path.join(self.directory, name))
+
+
+def cached(filepath, analysis, params, compute, cache=None):
+    """Return compute() for this file/analysis/params, reusing a cached result."""
+    cache = cache or ResultCache()
+    key = cache_key(filepath, analysis, params)
+    hit, value = cache.get(key)
+    if hit:
+        return value
+    value = compute()
+    cache.put(key, value)
+    return value
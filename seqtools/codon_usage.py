@@ -0,0 +1,121 @@
+"""Codon usage, RSCU and CAI on genome x 64 codon count matrices."""
+
+import os
+
+import numpy as np
+
+from .encoding import BASES
+from .fasta import read_fasta_records
+from .orfs import MIN_ORF_LENGTH, find_orfs, orf_codon_indices
+from .parallel import run_jobs
+from .translate import codon_table
+
+# Column order of every count vector: codon index 16*b1 + 4*b2 + b3
+CODON_NAMES = [a + b + c for a in BASES for b in BASES for c in BASES]
+
+
+def codon_counts(seq, min_length=MIN_ORF_LENGTH, strands=(1, -1), **orf_options):
+    """int64 counts (length 64) of the codons inside the ORFs of seq.
+
+    orf_options go to orfs.find_orfs (start_codons, include_partial, ...).
+    Codons containing N are not counted.
+    """
+    orfs = find_orfs(seq, min_length, strands=strands, **orf_options)
+    indices = orf_codon_indices(seq, orfs)
+    return np.bincount(indices[indices >= 0], minlength=64)
+
+
+def _count_file_job(args):
+    filepath, options = args
+    total = np.zeros(64, dtype=np.int64)
+    for _, seq in read_fasta_records(filepath):
+        total += codon_counts(seq, **options)
+    return total
+
+
+def codon_usage_matrix(filepaths, workers=None, progress=None, **options):
+    """Return (names, matrix) with one row of codon counts per FASTA file.
+
+    Files are counted in a process pool; the records of a multi-record file
+    (e.g. influenza segments) are merged into one row. options go to
+    codon_counts. progress(files_done, n_files) is called as files finish.
+    """
+    jobs = [(path, options) for path in filepaths]
+    rows = run_jobs(jobs, workers or os.cpu_count() or 1, progress, _count_file_job)
+    names = [os.path.basename(path) for path in filepaths]
+    matrix = np.vstack(rows) if rows else np.zeros((0, 64), dtype=np.int64)
+    return names, matrix
+
+
+def _families(table):
+    """(64 x families one-hot matrix, amino acid letter of each family)."""
+    aa = codon_table(table)[:64]
+    letters, family = np.unique(aa, return_inverse=True)
+    onehot = np.zeros((64, len(letters)))
+    onehot[np.arange(64), family] = 1
+    return onehot, letters
+
+
+def rscu(counts, table=1):
+    """Relative synonymous codon usage for a count vector or matrix.
+
+    Observed count over the mean count of the codons for the same amino
+    acid; 0 where the amino acid never occurs.
+    """
+    counts = np.asarray(counts, dtype=float)
+    onehot, _ = _families(table)
+    expected = (counts @ onehot / onehot.sum(axis=0)) @ onehot.T
+    return np.divide(counts, expected, out=np.zeros_like(counts), where=expected > 0)
+
+
+def relative_adaptiveness(reference_counts, table=1):
+    """CAI weights w: RSCU over the largest RSCU of the same amino acid.
+
+    A reference matrix is summed over its rows first.
+    """
+    reference_counts = np.asarray(reference_counts)
+    if reference_counts.ndim == 2:
+        reference_counts = reference_counts.sum(axis=0)
+    values = rscu(reference_counts, table)
+    onehot, _ = _families(table)
+    family_max = np.max(values[:, None] * onehot, axis=0)
+    best = onehot @ family_max
+    return np.divide(values, best, out=np.zeros_like(values), where=best > 0)
+
+
+def cai(counts, weights, table=1, pseudo_weight=0.01):
+    """Codon adaptation index of each row of counts against weights.
+
+    Stops and single-codon amino acids (Met, Trp in the standard code) are
+    left out; codons absent from the reference get pseudo_weight.
+    """
+    counts = np.asarray(counts, dtype=float)
+    onehot, letters = _families(table)
+    informative = (onehot @ (onehot.sum(axis=0) > 1)).astype(bool)
+    informative &= onehot @ (letters != ord("*")) > 0
+    log_w = np.log(np.where(weights > 0, weights, pseudo_weight))[informative]
+    used = counts[..., informative]
+    total = used.sum(axis=-1)
+    score = np.exp(np.divide(used @ log_w, total, out=np.zeros_like(total), where=total > 0))
+    return np.where(total > 0, score, np.nan)
+
+
+def amino_acid_counts(counts, table=1):
+    """Return (counts summed per amino acid, the amino acid letter of each column)."""
+    onehot, letters = _families(table)
+    return np.asarray(counts) @ onehot, [chr(a) for a in letters]
+
+
+def usage_frequencies(counts):
+    """Rows scaled to sum to 1 (all-zero rows stay zero)."""
+    counts = np.asarray(counts, dtype=float)
+    total = counts.sum(axis=-1, keepdims=True)
+    return np.divide(counts, total, out=np.zeros_like(counts), where=total > 0)
+
+
+def write_usage_matrix(path, names, matrix):
+    """Write a genome x codon table as tab-separated text with a header row."""
+    with open(path, "w") as f:
+        f.write("genome\t" + "\t".join(CODON_NAMES) + "\n")
+        for name, row in zip(names, matrix):
+            f.write(name + "\t" + "\t".join(str(int(v)) for v in row) + "\n")
@@ -0,0 +1,138 @@
+"""Transparent plain / gzip / BGZF input for the sequence readers."""
+
+import gzip
+import os
+import struct
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+GZIP_MAGIC = b"\x1f\x8b"
+FEXTRA = 0x04
+
+
+def detect_compression(filepath):
+    """Return None, "gzip" or "bgzf" by looking at the file's magic bytes."""
+    with open(filepath, "rb") as f:
+        head = f.read(18)
+    if not head.startswith(GZIP_MAGIC):
+        return None
+    if len(head) >= 18 and head[3] & FEXTRA and _bgzf_block_size(head[10:12], head[12:]) is not None:
+        return "bgzf"
+    return "gzip"
+
+
+def _bgzf_block_size(xlen_bytes, extra):
+    """Return BSIZE from a gzip extra field, or None if it has no BC subfield."""
+    (xlen,) = struct.unpack("<H", xlen_bytes)
+    extra = extra[:xlen]
+    pos = 0
+    while pos + 4 <= len(extra):
+        si1, si2, slen = extra[pos], extra[pos + 1], struct.unpack("<H", extra[pos + 2:pos + 4])[0]
+        if si1 == 66 and si2 == 67 and slen == 2:  # "BC"
+            return struct.unpack("<H", extra[pos + 4:pos + 6])[0]
+        pos += 4 + slen
+    return None
+
+
+def _iter_raw_blocks(f):
+    """Yield the raw bytes of each BGZF block in file order."""
+    while True:
+        fixed = f.read(12)
+        if not fixed:
+            return
+        if len(fixed) < 12 or not fixed.startswith(GZIP_MAGIC):
+            raise ValueError("Truncated or invalid BGZF block header")
+        (xlen,) = struct.unpack("<H", fixed[10:12])
+        extra = f.read(xlen)
+        bsize = _bgzf_block_size(fixed[10:12], extra)
+        if bsize is None:
+            raise ValueError("gzip member without BGZF block size")
+        rest = f.read(bsize + 1 - 12 - xlen)
+        if len(rest) != bsize + 1 - 12 - xlen:
+            raise ValueError("Truncated BGZF block")
+        yield rest
+
+
+def _inflate_block(rest):
+    """Decompress one BGZF block body (deflate data + CRC32 + ISIZE)."""
+    crc, isize = struct.unpack("<II", rest[-8:])
+    data = zlib.decompress(rest[:-8], -15)
+    if len(data) != isize or zlib.crc32(data) != crc:
+        raise ValueError("BGZF block failed CRC/size check")
+    return data
+
+
+def _iter_bgzf_data(f, threads):
+    """Yield decompressed BGZF blocks in order, inflating them on a thread pool.
+
+    zlib releases the GIL while inflating, so blocks decode in parallel.
+    At most 4 * threads blocks are in flight to keep memory bounded.
+    """
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        pending = deque()
+        for rest in _iter_raw_blocks(f):
+            pending.append(pool.submit(_inflate_block, rest))
+            if len(pending) >= 4 * threads:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+class BgzfReader:
+    """Minimal read-only binary file object over a BGZF file."""
+
+    def __init__(self, filepath, threads=None):
+        self._raw = open(filepath, "rb")
+        self._blocks = _iter_bgzf_data(self._raw, threads or os.cpu_count() or 1)
+        self._buf = b""
+
+    def read(self, size=-1):
+        parts = [self._buf]
+        n = len(self._buf)
+        while size < 0 or n < size:
+            block = next(self._blocks, None)
+            if block is None:
+                break
+            parts.append(block)
+            n += len(block)
+        data = b"".join(parts)
+        if size < 0:
+            self._buf = b""
+            return data
+        self._buf = data[size:]
+        return data[:size]
+
+    def close(self):
+        self._blocks.close()
+        self._raw.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def raw_position(f):
+    """Return how far into the underlying (possibly compressed) file f has read."""
+    if isinstance(f, BgzfReader):
+        return f._raw.tell()
+    if isinstance(f, gzip.GzipFile):
+        return f.fileobj.tell()
+    return f.tell()
+
+
+def open_binary(filepath, threads=None):
+    """Open a plain, gzip or BGZF file for binary reading.
+
+    Compression is detected from the magic bytes, not the extension.
+    BGZF blocks are inflated on `threads` worker threads (default: all
+    cores); ordinary gzip streams cannot be split and decode on one thread.
+    """
+    kind = detect_compression(filepath)
+    if kind == "bgzf":
+        return BgzfReader(filepath, threads)
+    if kind == "gzip":
+        return gzip.open(filepath, "rb")
+    return open(filepath, "rb")
@@ -0,0 +1,61 @@
+"""Single-pass symbol counting with byte histograms."""
+
+from collections import Counter
+
+import numpy as np
+
+CHUNK_SIZE = 1 << 24  # 16 MiB per bincount call
+
+
+def _iter_chunks(data, chunk_size):
+    if isinstance(data, (str, bytes, bytearray, memoryview)):
+        data = [data]
+    for part in data:
+        for i in range(0, len(part), chunk_size):
+            yield part[i:i + chunk_size]
+
+
+def _histogram(chunk):
+    return np.bincount(np.frombuffer(chunk, dtype=np.uint8), minlength=256)
+
+
+def count_bytes(data, chunk_size=CHUNK_SIZE):
+    """Return an int64 histogram of length 256 over all bytes of data."""
+    counts = np.zeros(256, dtype=np.int64)
+    for chunk in _iter_chunks(data, chunk_size):
+        counts += _histogram(chunk)
+    return counts
+
+
+def histogram_to_dict(histogram):
+    return {chr(b): int(histogram[b]) for b in np.flatnonzero(histogram)}
+
+
+def symbol_counts(data, chunk_size=CHUNK_SIZE):
+    """Return {symbol: exact count} for all symbols in data in one pass.
+
+    data may be a str/bytes sequence or an iterable of such parts (e.g. the
+    generator returned by a FASTA reader); it is consumed chunk by chunk.
+    """
+    histogram = np.zeros(256, dtype=np.int64)
+    other = Counter()  # symbols outside latin-1, counted the slow way
+    for chunk in _iter_chunks(data, chunk_size):
+        if isinstance(chunk, str):
+            try:
+                chunk = chunk.encode("latin-1")
+            except UnicodeEncodeError:
+                other.update(chunk)
+                continue
+        histogram += _histogram(chunk)
+    counts = histogram_to_dict(histogram)
+    for symbol, count in other.items():
+        counts[symbol] = counts.get(symbol, 0) + count
+    return counts
+
+
+def to_percentages(counts):
+    """Convert {symbol: count} to {symbol: percentage of the total}."""
+    total = sum(counts.values())
+    if total == 0:
+        return {}
+    return {symbol: count / total * 100 for symbol, count in counts.items()}
@@ -0,0 +1,118 @@
+"""Compact uint8 / 2-bit nucleotide arrays shared by the analyses."""
+
+import numpy as np
+
+BASES = "ACGT"
+N_CODE = 4  # any non-ACGT symbol (N, IUPAC ambiguity codes, gaps)
+
+_ENCODE = np.full(256, N_CODE, dtype=np.uint8)
+for _code, _base in enumerate(BASES):
+    _ENCODE[ord(_base)] = _code
+    _ENCODE[ord(_base.lower())] = _code
+_ENCODE[ord("U")] = _ENCODE[ord("u")] = 3
+_DECODE = np.frombuffer(b"ACGTN", dtype=np.uint8)
+
+
+def encode(seq):
+    """Return a uint8 code array (A=0, C=1, G=2, T/U=3, other=4)."""
+    if isinstance(seq, str):
+        seq = seq.encode("ascii", errors="replace")
+    return _ENCODE[np.frombuffer(seq, dtype=np.uint8)]
+
+
+def decode(codes):
+    return _DECODE[codes].tobytes().decode("ascii")
+
+
+def pack_2bit(codes):
+    """Pack codes four bases per byte; non-ACGT positions are stored as A."""
+    codes = np.where(codes < 4, codes, 0).astype(np.uint8)
+    padded = np.zeros(-(-len(codes) // 4) * 4, dtype=np.uint8)
+    padded[:len(codes)] = codes
+    quads = padded.reshape(-1, 4)
+    return (quads[:, 0] << 6) | (quads[:, 1] << 4) | (quads[:, 2] << 2) | quads[:, 3]
+
+
+def unpack_2bit(packed, length):
+    shifts = np.array([6, 4, 2, 0], dtype=np.uint8)
+    return ((packed[:, None] >> shifts) & 3).astype(np.uint8).ravel()[:length]
+
+
+class NucleotideArray:
+    """Nucleotide sequence held as a NumPy uint8 code array.
+
+    Slicing returns a NucleotideArray that is a view on the same buffer.
+    Positions that are not A/C/G/T are coded as N_CODE and reported by
+    `mask`.
+    """
+
+    __slots__ = ("codes",)
+
+    def __init__(self, codes):
+        self.codes = np.asarray(codes, dtype=np.uint8)
+
+    @classmethod
+    def from_str(cls, seq):
+        return cls(encode(seq))
+
+    @classmethod
+    def from_packed(cls, packed, length, mask=None):
+        codes = unpack_2bit(packed, length)
+        if mask is not None:
+            codes[np.unpackbits(mask, count=length).astype(bool)] = N_CODE
+        return cls(codes)
+
+    def pack(self):
+        """Return (packed 2-bit bases, packed N mask or None, length)."""
+        mask = self.mask
+        packed_mask = np.packbits(mask) if mask.any() else None
+        return pack_2bit(self.codes), packed_mask, len(self)
+
+    @property
+    def mask(self):
+        return self.codes == N_CODE
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return NucleotideArray(self.codes[key])
+        return BASES[self.codes[key]] if self.codes[key] < 4 else "N"
+
+    def __str__(self):
+        return decode(self.codes)
+
+    def __repr__(self):
+        preview = decode(self.codes[:20])
+        return f"NucleotideArray('{preview}{'...' if len(self) > 20 else ''}', length={len(self)})"
+
+    def __eq__(self, other):
+        if isinstance(other, str):
+            other = encode(other)
+        elif isinstance(other, NucleotideArray):
+            other = other.codes
+        else:
+            return NotImplemented
+        return len(self.codes) == len(other) and bool(np.array_equal(self.codes, other))
+
+    __hash__ = None
+
+    def reverse_complement(self):
+        rc = 3 - self.codes[::-1]
+        rc[self.codes[::-1] == N_CODE] = N_CODE
+        return NucleotideArray(rc)
+
+
+def as_codes(seq):
+    """Return the uint8 code array for a str, bytes or NucleotideArray."""
+    if isinstance(seq, NucleotideArray):
+        return seq.codes
+    if isinstance(seq, np.ndarray):
+        return seq
+    return encode(seq)
+
+
+def as_text(seq):
+    """Return seq as a str, decoding a NucleotideArray if needed."""
+    return str(seq) if isinstance(seq, NucleotideArray) else seq
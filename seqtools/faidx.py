@@ -0,0 +1,149 @@
+"""Indexed (.fai-style) random access to FASTA files through mmap."""
+
+import mmap
+import os
+from collections import namedtuple
+
+from .compression import detect_compression
+
+FaiEntry = namedtuple("FaiEntry", "name length offset line_bases line_width")
+
+
+def build_index(filepath):
+    """Scan a FASTA file and return {name: FaiEntry} in file order.
+
+    Every sequence line of a record except the last must have the same
+    length, as required by the samtools .fai format.
+    """
+    index = {}
+    name = None
+    length = offset = line_bases = line_width = 0
+    short_line_seen = False
+    pos = 0
+    with open(filepath, "rb") as f:
+        for line in f:
+            line_len = len(line)
+            if line.startswith(b">"):
+                if name is not None:
+                    index[name] = FaiEntry(name, length, offset, line_bases, line_width)
+                name = line[1:].split(None, 1)[0].decode("ascii")
+                if name in index:
+                    raise ValueError(f"Duplicate record name '{name}'")
+                length = line_bases = line_width = 0
+                offset = pos + line_len
+                short_line_seen = False
+            elif name is not None:
+                bases = len(line.rstrip(b"\r\n"))
+                if not bases:
+                    short_line_seen = True
+                    pos += line_len
+                    continue
+                if line_bases == 0:
+                    line_bases, line_width = bases, line_len
+                elif short_line_seen or bases > line_bases:
+                    raise ValueError(f"Record '{name}' has uneven line lengths")
+                elif bases < line_bases:
+                    short_line_seen = True
+                length += bases
+            pos += line_len
+    if name is not None:
+        index[name] = FaiEntry(name, length, offset, line_bases, line_width)
+    return index
+
+
+def write_index(index, fai_path):
+    with open(fai_path, "w") as f:
+        for e in index.values():
+            f.write(f"{e.name}\t{e.length}\t{e.offset}\t{e.line_bases}\t{e.line_width}\n")
+
+
+def read_index(fai_path):
+    index = {}
+    with open(fai_path, "r") as f:
+        for line in f:
+            fields = line.rstrip("\n").split("\t")
+            if len(fields) < 5:
+                continue
+            name = fields[0]
+            index[name] = FaiEntry(name, *(int(v) for v in fields[1:5]))
+    return index
+
+
+def load_or_build_index(filepath):
+    """Return the index for filepath, (re)building <filepath>.fai if stale.
+
+    If the .fai cannot be written (read-only data directory), the freshly
+    built index is used from memory.
+    """
+    fai_path = str(filepath) + ".fai"
+    if os.path.exists(fai_path) and os.path.getmtime(fai_path) >= os.path.getmtime(filepath):
+        return read_index(fai_path)
+    index = build_index(filepath)
+    try:
+        write_index(index, fai_path)
+    except OSError:
+        pass
+    return index
+
+
+class IndexedFasta:
+    """Memory-mapped FASTA with random [start, end) subsequence fetches."""
+
+    def __init__(self, filepath):
+        if detect_compression(filepath):
+            raise ValueError(f"'{filepath}' is compressed; indexed access needs an uncompressed FASTA")
+        self.filepath = filepath
+        self.index = load_or_build_index(filepath)
+        self._file = open(filepath, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def close(self):
+        self._mm.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def names(self):
+        return list(self.index)
+
+    def length(self, name):
+        return self.index[name].length
+
+    def _byte_offset(self, entry, pos):
+        line, col = divmod(pos, entry.line_bases)
+        return entry.offset + line * entry.line_width + col
+
+    def fetch(self, name, start=0, end=None):
+        """Return bases [start, end) of record name as an uppercase str."""
+        entry = self.index[name]
+        if end is None or end > entry.length:
+            end = entry.length
+        start = max(start, 0)
+        if start >= end:
+            return ""
+        raw = self._mm[self._byte_offset(entry, start):self._byte_offset(entry, end)]
+        return raw.translate(None, b"\r\n").decode("ascii").upper()
+
+    def iter_regions(self, name, region_size, overlap=0):
+        """Yield (start, subsequence) blocks covering record name.
+
+        Consecutive blocks share overlap bases so that windows of length
+        overlap + 1 are never split between two blocks.
+        """
+        if region_size <= overlap:
+            raise ValueError("region_size must be larger than overlap")
+        length = self.index[name].length
+        start = 0
+        while start < length:
+            end = min(start + region_size, length)
+            yield start, self.fetch(name, start, end)
+            if end == length:
+                break
+            start = end - overlap
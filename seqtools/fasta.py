@@ -0,0 +1,114 @@
+"""Streaming FASTA reader shared by the lab scripts."""
+
+import os
+
+from .compression import open_binary, raw_position
+
+CHUNK_SIZE = 1 << 20  # 1 MiB binary reads
+
+
+def _iter_lines(f, chunk_size, on_chunk=None):
+    """Yield lines (without line endings) from a binary file read in chunks."""
+    tail = b""
+    while True:
+        chunk = f.read(chunk_size)
+        if on_chunk is not None:
+            on_chunk()
+        if not chunk:
+            break
+        lines = (tail + chunk).split(b"\n")
+        tail = lines.pop()
+        for line in lines:
+            yield line.rstrip(b"\r")
+    if tail:
+        yield tail.rstrip(b"\r")
+
+
+def iter_fasta(f, chunk_size=CHUNK_SIZE, on_chunk=None):
+    """Yield (header, sequence) records from an open binary file object."""
+    header = None
+    parts = []
+    for line in _iter_lines(f, chunk_size, on_chunk):
+        if line.startswith(b">"):
+            if header is not None:
+                yield header, b"".join(parts).decode("ascii", errors="replace")
+            header = line[1:].strip().decode("ascii", errors="replace")
+            parts = []
+        elif header is not None:
+            line = line.strip()
+            if line:
+                parts.append(line)
+    if header is not None:
+        yield header, b"".join(parts).decode("ascii", errors="replace")
+
+
+def iter_fasta_pieces(f, piece_size=CHUNK_SIZE, on_chunk=None):
+    """Yield (header, bytes) pieces of about piece_size bases per record.
+
+    Unlike iter_fasta a record is never joined as a whole, so memory stays
+    at one piece however long the chromosome is. Consecutive pieces with the
+    same header continue the same record; a record without sequence gives
+    one empty piece, as iter_fasta gives it an empty sequence.
+    """
+    header = None
+    parts = []
+    size = 0
+    pending = False  # header seen but nothing yielded for it yet
+    for line in _iter_lines(f, piece_size, on_chunk):
+        if line.startswith(b">"):
+            if parts or pending:
+                yield header, b"".join(parts)
+            header = line[1:].strip().decode("ascii", errors="replace")
+            parts = []
+            size = 0
+            pending = True
+        elif header is not None:
+            line = line.strip()
+            parts.append(line)
+            size += len(line)
+            if size >= piece_size:
+                yield header, b"".join(parts)
+                parts = []
+                size = 0
+                pending = False
+    if parts or pending:
+        yield header, b"".join(parts)
+
+
+def progress_callback(f, filepath, progress):
+    """Wrap progress(done, total) as a per-chunk hook reporting the file offset."""
+    if progress is None:
+        return None
+    total = os.path.getsize(filepath)
+    return lambda: progress(raw_position(f), total)
+
+
+def read_fasta_records(filepath, chunk_size=CHUNK_SIZE, threads=None, progress=None):
+    """Lazily yield (header, sequence) for every record in a FASTA file.
+
+    The file is read in large binary chunks and each record's sequence is
+    joined once, so memory stays at roughly one record at a time. gzip and
+    BGZF input is decompressed on the fly (see compression.open_binary).
+    If given, progress(bytes_read, file_size) is called after every chunk.
+    """
+    with open_binary(filepath, threads) as f:
+        yield from iter_fasta(f, chunk_size, progress_callback(f, filepath, progress))
+
+
+def read_fasta_pieces(filepath, piece_size=CHUNK_SIZE, threads=None, progress=None):
+    """Lazily yield (header, bytes) pieces of every record (see iter_fasta_pieces)."""
+    with open_binary(filepath, threads) as f:
+        yield from iter_fasta_pieces(f, piece_size, progress_callback(f, filepath, progress))
+
+
+def read_first_sequence(filepath, upper=True, progress=None):
+    """Return the sequence of the first record in a FASTA file."""
+    for _, sequence in read_fasta_records(filepath, progress=progress):
+        return sequence.upper() if upper else sequence
+    return ""
+
+
+def read_concatenated(filepath, upper=True, progress=None):
+    """Return all records of a FASTA file joined into one sequence."""
+    sequence = "".join(seq for _, seq in read_fasta_records(filepath, progress=progress))
+    return sequence.upper() if upper else sequence
@@ -0,0 +1,115 @@
+"""Streaming FASTQ reader with batched, quality-aware composition stats."""
+
+import numpy as np
+
+from .compression import open_binary
+from .counting import histogram_to_dict, to_percentages
+from .encoding import BASES, encode
+from .fasta import CHUNK_SIZE, _iter_lines, progress_callback
+
+BATCH_SIZE = 100_000
+PHRED_OFFSET = 33
+
+
+def iter_fastq_batches(filepath, batch_size=BATCH_SIZE, chunk_size=CHUNK_SIZE, progress=None):
+    """Yield lists of (name, sequence, quality) bytes tuples, batch_size at a time."""
+    batch = []
+    with open_binary(filepath) as f:
+        lines = _iter_lines(f, chunk_size, progress_callback(f, filepath, progress))
+        for header in lines:
+            if not header:
+                continue
+            if not header.startswith(b"@"):
+                raise ValueError(f"Expected FASTQ header, got {header[:30]!r}")
+            seq = next(lines, None)
+            plus = next(lines, None)
+            qual = next(lines, None)
+            if qual is None or not plus.startswith(b"+"):
+                raise ValueError(f"Truncated FASTQ record {header[:30]!r}")
+            if len(qual) != len(seq):
+                raise ValueError(f"Sequence and quality lengths differ in {header[:30]!r}")
+            batch.append((header[1:], seq, qual))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+    if batch:
+        yield batch
+
+
+def is_fastq(filepath):
+    """Return True if the first non-empty byte of the file is '@'."""
+    with open_binary(filepath) as f:
+        head = f.read(256).lstrip()
+    return head.startswith(b"@")
+
+
+class FastqStats:
+    """Accumulates symbol counts, per-position base composition and quality.
+
+    Memory is bounded by the longest read, not by the number of reads.
+    """
+
+    def __init__(self, phred_offset=PHRED_OFFSET):
+        self.phred_offset = phred_offset
+        self.reads = 0
+        self.symbol_counts = np.zeros(256, dtype=np.int64)
+        self.position_counts = np.zeros((0, len(BASES) + 1), dtype=np.int64)  # A C G T N
+        self.quality_sums = np.zeros(0, dtype=np.int64)
+
+    def _grow(self, length):
+        if length > len(self.quality_sums):
+            extra = length - len(self.quality_sums)
+            self.position_counts = np.vstack(
+                [self.position_counts, np.zeros((extra, len(BASES) + 1), dtype=np.int64)]
+            )
+            self.quality_sums = np.concatenate([self.quality_sums, np.zeros(extra, dtype=np.int64)])
+
+    def update(self, batch):
+        if not batch:
+            return
+        lengths = np.fromiter((len(seq) for _, seq, _ in batch), dtype=np.int64, count=len(batch))
+        seq_bytes = np.frombuffer(b"".join(seq for _, seq, _ in batch), dtype=np.uint8)
+        qual = np.frombuffer(b"".join(q for _, _, q in batch), dtype=np.uint8).astype(np.int64)
+        self.reads += len(batch)
+        self.symbol_counts += np.bincount(seq_bytes, minlength=256)
+
+        max_len = int(lengths.max()) if len(lengths) else 0
+        self._grow(max_len)
+        # position of every base within its own read
+        read_starts = np.cumsum(lengths) - lengths
+        positions = np.arange(len(seq_bytes)) - np.repeat(read_starts, lengths)
+        codes = encode(seq_bytes.tobytes())
+        width = len(BASES) + 1
+        self.position_counts[:max_len] += np.bincount(
+            positions * width + codes, minlength=max_len * width
+        ).reshape(max_len, width)
+        self.quality_sums[:max_len] += np.bincount(
+            positions, weights=qual - self.phred_offset, minlength=max_len
+        ).astype(np.int64)
+
+    def frequencies(self):
+        """Return {symbol: percentage} over all bases, like calculate_frequencies."""
+        return to_percentages(histogram_to_dict(self.symbol_counts))
+
+    def composition(self):
+        """Per-position base fractions, shape (read_length, 5) for A, C, G, T, N."""
+        totals = self.position_counts.sum(axis=1, keepdims=True)
+        return self.position_counts / np.maximum(totals, 1)
+
+    def mean_quality(self):
+        """Mean Phred quality at each read position."""
+        return self.quality_sums / np.maximum(self.position_counts.sum(axis=1), 1)
+
+
+def fastq_stats(filepath, batch_size=BATCH_SIZE, progress=None, on_batch=None):
+    """Compute FastqStats for a (possibly compressed) FASTQ file in one pass.
+
+    on_batch(stats), if given, is called after every batch with the
+    running totals so callers can show incremental results.
+    """
+    stats = FastqStats()
+    for batch in iter_fastq_batches(filepath, batch_size, progress=progress):
+        stats.update(batch)
+        if on_batch is not None:
+            on_batch(stats)
+    return stats
@@ -0,0 +1,102 @@
+"""Run long analyses off the Tk main thread and report back through a queue."""
+
+import queue
+import threading
+
+
+class TaskCancelled(Exception):
+    """Raised inside a worker when the user pressed Cancel."""
+
+
+class BackgroundTask:
+    """Runs func(task) on a worker thread; Tk callbacks run on the main thread.
+
+    The worker reports through task.progress(done, total), task.status(text)
+    and task.partial(result). Those calls post messages to a queue that is
+    drained with root.after, and raise TaskCancelled once cancel() has been
+    requested so the worker stops at its next report.
+    """
+
+    POLL_MS = 100
+
+    def __init__(self, root, func, on_done, on_error=None, on_progress=None,
+                 on_status=None, on_partial=None, on_cancelled=None):
+        self.root = root
+        self.func = func
+        self.callbacks = {
+            "done": on_done,
+            "error": on_error,
+            "progress": on_progress,
+            "status": on_status,
+            "partial": on_partial,
+            "cancelled": on_cancelled,
+        }
+        self._queue = queue.Queue()
+        self._cancel = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self.finished = False
+
+    def start(self):
+        self._thread.start()
+        self.root.after(self.POLL_MS, self._poll)
+        return self
+
+    def cancel(self):
+        self._cancel.set()
+
+    def _check(self):
+        if self._cancel.is_set():
+            raise TaskCancelled()
+
+    def progress(self, done, total):
+        self._check()
+        self._queue.put(("progress", done / total if total else 0.0))
+
+    def status(self, text):
+        self._check()
+        self._queue.put(("status", text))
+
+    def partial(self, result):
+        self._check()
+        self._queue.put(("partial", result))
+
+    def _run(self):
+        try:
+            result = self.func(self)
+            self._check()
+            self._queue.put(("done", result))
+        except TaskCancelled:
+            self._queue.put(("cancelled", None))
+        except Exception as e:
+            self._queue.put(("error", e))
+
+    def _poll(self):
+        last_progress = None
+        final = None
+        while True:
+            try:
+                kind, payload = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "progress":
+                last_progress = payload  # only the latest value matters
+            elif kind in ("done", "error", "cancelled"):
+                final = (kind, payload)
+            else:
+                self._call(kind, payload)
+        if last_progress is not None:
+            self._call("progress", last_progress)
+        if final is None:
+            self.root.after(self.POLL_MS, self._poll)
+            return
+        self.finished = True
+        kind, payload = final
+        if kind == "cancelled":
+            self._call(kind)
+        else:
+            self._call(kind, payload)
+
+    def _call(self, kind, *args):
+        callback = self.callbacks[kind]
+        if callback is not None:
+            callback(*args)
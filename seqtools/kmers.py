@@ -0,0 +1,302 @@
+"""Vectorized k-mer counting on 2-bit integer codes."""
+
+import tempfile
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .encoding import BASES, N_CODE, NucleotideArray, as_codes, decode
+
+MAX_DENSE_K = 12  # 4**12 counters = 128 MiB of int64
+MAX_PACKED_K = 32  # 2 bits per base in a uint64
+MAX_BASE5_K = 27  # 5**27 < 2**64: ACGT plus N as a fifth symbol
+
+
+def kmer_codes(seq, k, canonical=False):
+    """Return (codes, starts): the uint64 2-bit code of every k-mer and its position.
+
+    Codes are built by shifting in one base per step over the whole array.
+    Windows that contain a non-ACGT symbol are dropped. With canonical=True
+    the reverse-complement code is built in the same loop and each k-mer is
+    reported as min(forward, reverse complement).
+    """
+    if not 1 <= k <= MAX_PACKED_K:
+        raise ValueError(f"k must be between 1 and {MAX_PACKED_K}")
+    bases = as_codes(seq)
+    m = len(bases) - k + 1
+    if m <= 0:
+        return np.zeros(0, dtype=np.uint64), np.zeros(0, dtype=np.int64)
+    codes, rc_codes = rolling_codes(bases, k, canonical)
+    if canonical:
+        codes = np.minimum(codes, rc_codes)
+    bad = np.concatenate([[0], np.cumsum(bases == N_CODE)])
+    valid = (bad[k:] - bad[:-k]) == 0
+    starts = np.flatnonzero(valid)
+    return codes[valid], starts
+
+
+def rolling_codes(bases, k, reverse_complement=True):
+    """Forward (and reverse-complement) 2-bit codes of every k-window of a code array.
+
+    Non-ACGT positions are not masked here; see kmer_codes.
+    """
+    m = len(bases) - k + 1
+    values = (bases & 3).astype(np.uint64)
+    codes = np.zeros(m, dtype=np.uint64)
+    rc_codes = np.zeros(m, dtype=np.uint64) if reverse_complement else None
+    for j in range(k):
+        window_base = values[j:j + m]
+        codes = (codes << np.uint64(2)) | window_base
+        if reverse_complement:
+            # complement of base j lands at position k-1-j of the reverse strand
+            rc_codes |= (np.uint64(3) - window_base) << np.uint64(2 * j)
+    return codes, rc_codes
+
+
+def base5_codes(bases, k, reverse_complement=False):
+    """Base-5 codes (A, C, G, T, N = 0..4) of every k-window, N windows included.
+
+    With reverse_complement=True the code of each window's reverse
+    complement is returned too (N stays N); otherwise that value is None.
+    """
+    if not 1 <= k <= MAX_BASE5_K:
+        raise ValueError(f"k must be between 1 and {MAX_BASE5_K}")
+    m = max(len(bases) - k + 1, 0)
+    values = np.minimum(bases, N_CODE).astype(np.uint64)
+    complement = np.where(values < 4, 3 - values.astype(np.int64), N_CODE).astype(np.uint64)
+    codes = np.zeros(m, dtype=np.uint64)
+    rc_codes = np.zeros(m, dtype=np.uint64) if reverse_complement else None
+    for j in range(k):
+        codes = codes * np.uint64(5) + values[j:j + m]
+        if reverse_complement:
+            rc_codes += complement[j:j + m] * np.uint64(5 ** j)
+    return codes, rc_codes
+
+
+def _first_occurrence_dict(keys, first, counts, to_kmer, min_count):
+    """{kmer: count} for counts >= min_count, ordered by first occurrence."""
+    keep = counts >= min_count
+    order = np.argsort(first[keep], kind="stable")
+    return {to_kmer(key): int(count)
+            for key, count in zip(keys[keep][order], counts[keep][order])}
+
+
+def count_kmers_ordered(seq, k, canonical=False, min_count=1):
+    """{kmer: count} of the ACGT-only k-mers, in order of first occurrence.
+
+    The same keys a substring loop inserts into a dict, in the same order,
+    so reports that sort by count keep their tie order.
+    """
+    codes, _ = kmer_codes(seq, k, canonical)
+    keys, first, counts = np.unique(codes, return_index=True, return_counts=True)
+    return _first_occurrence_dict(keys, first, counts, lambda key: code_to_kmer(key, k), min_count)
+
+
+def count_kmers_with_n(seq, k, canonical=False):
+    """{kmer: count} over every window, those holding N included (as 'N').
+
+    Windows are counted as base-5 codes (or as raw byte rows for k above
+    MAX_BASE5_K) with one np.unique; only the distinct k-mers are decoded.
+    canonical=True merges each k-mer with its reverse complement, as
+    canonical_kmer does on strings. Keys are in order of first occurrence.
+    """
+    bases = np.minimum(as_codes(seq), N_CODE)
+    if len(bases) < k:
+        return {}
+    if k <= MAX_BASE5_K:
+        codes, _ = base5_codes(bases, k)
+        keys, first, counts = np.unique(codes, return_index=True, return_counts=True)
+        powers = np.uint64(5) ** np.arange(k - 1, -1, -1, dtype=np.uint64)
+        rows = ((keys[:, None] // powers) % np.uint64(5)).astype(np.uint8)
+    else:
+        windows = np.ascontiguousarray(sliding_window_view(bases, k))
+        keys, first, counts = np.unique(windows.view(f"V{k}").ravel(),
+                                        return_index=True, return_counts=True)
+        rows = keys.view(np.uint8).reshape(-1, k)
+    order = np.argsort(first, kind="stable")
+    rows, counts = rows[order], counts[order]
+    result = {}
+    for row, count in zip(rows, counts.tolist()):
+        kmer = decode(row)
+        if canonical:
+            kmer = canonical_kmer(kmer)
+        result[kmer] = result.get(kmer, 0) + count
+    return result
+
+
+def kmer_to_code(kmer):
+    code = 0
+    for base in kmer:
+        code = (code << 2) | BASES.index(base)
+    return code
+
+
+_COMPLEMENT = str.maketrans("ACGTacgt", "TGCAtgca")
+
+
+def canonical_kmer(kmer):
+    """Return the smaller of kmer and its reverse complement (same order as the codes)."""
+    return min(kmer, kmer.translate(_COMPLEMENT)[::-1])
+
+
+def code_to_kmer(code, k):
+    return "".join(BASES[(int(code) >> (2 * (k - 1 - j))) & 3] for j in range(k))
+
+
+def count_kmers_dense(seq, k, canonical=False):
+    """Return an int64 array of length 4**k with the count of every k-mer.
+
+    Overlapping occurrences are all counted; index i is the k-mer whose
+    2-bit code is i (A=0, C=1, G=2, T=3, first base most significant).
+    In canonical mode only canonical k-mers have non-zero counts.
+    """
+    if k > MAX_DENSE_K:
+        raise ValueError(f"Dense counting supports k <= {MAX_DENSE_K}")
+    codes, _ = kmer_codes(seq, k, canonical)
+    return np.bincount(codes.astype(np.int64), minlength=4 ** k)
+
+
+def dense_to_dict(counts, k, nonzero_only=True):
+    """Map a dense count array back to {kmer string: count}."""
+    indices = np.flatnonzero(counts) if nonzero_only else range(len(counts))
+    return {code_to_kmer(i, k): int(counts[i]) for i in indices}
+
+
+def kmer_percentages(seq, k, nonzero_only=True, canonical=False):
+    """{kmer: percentage of the len(seq) - k + 1 window positions}."""
+    total_positions = len(as_codes(seq)) - k + 1
+    if total_positions <= 0:
+        return {}
+    counts = count_kmers_dense(seq, k, canonical)
+    return {
+        kmer: count / total_positions * 100
+        for kmer, count in dense_to_dict(counts, k, nonzero_only).items()
+    }
+
+
+SPARSE_CHUNK = 1 << 22  # bases per chunk fed to np.unique
+MEMORY_BUDGET = 256 * 1024 * 1024  # bytes of (code, count) pairs held before spilling
+_PAIR_BYTES = 16  # one uint64 code + one int64 count
+
+
+def _merge_runs(codes, counts):
+    """Collapse (codes, counts) with repeated codes into sorted unique pairs."""
+    if len(codes) == 0:
+        return codes, counts
+    order = np.argsort(codes, kind="stable")
+    codes = codes[order]
+    counts = counts[order]
+    starts = np.flatnonzero(np.concatenate([[True], codes[1:] != codes[:-1]]))
+    return codes[starts], np.add.reduceat(counts, starts)
+
+
+def _iter_sequence_chunks(sequences, k, chunk_size):
+    """Yield code-array chunks that overlap by k - 1 so no k-mer is split or repeated."""
+    if isinstance(sequences, (str, bytes, np.ndarray, NucleotideArray)):
+        sequences = [sequences]
+    for seq in sequences:
+        bases = as_codes(seq)
+        step = max(chunk_size, k)
+        for start in range(0, max(len(bases) - k + 1, 0), step):
+            yield bases[start:start + step + k - 1]
+
+
+class _RunStore:
+    """Sorted (code, count) runs, kept in memory until the budget forces a spill to disk."""
+
+    def __init__(self, memory_budget, spill_dir):
+        self.memory_budget = memory_budget
+        self.spill_dir = spill_dir
+        self.pending = []
+        self.pending_bytes = 0
+        self.spilled = []  # path prefixes of sorted runs saved as .npy pairs
+        self._tmp = None
+
+    def add(self, codes, counts):
+        self.pending.append((codes, counts))
+        self.pending_bytes += len(codes) * _PAIR_BYTES
+        if self.pending_bytes > self.memory_budget:
+            codes, counts = self.collapse_pending()
+            if len(codes) * _PAIR_BYTES > self.memory_budget // 2:
+                self.spill(codes, counts)
+            else:
+                self.pending = [(codes, counts)]
+                self.pending_bytes = len(codes) * _PAIR_BYTES
+
+    def collapse_pending(self):
+        if not self.pending:
+            return np.zeros(0, dtype=np.uint64), np.zeros(0, dtype=np.int64)
+        codes = np.concatenate([c for c, _ in self.pending])
+        counts = np.concatenate([n for _, n in self.pending])
+        self.pending = []
+        self.pending_bytes = 0
+        return _merge_runs(codes, counts)
+
+    def spill(self, codes, counts):
+        if self._tmp is None:
+            self._tmp = tempfile.TemporaryDirectory(dir=self.spill_dir, prefix="kmers-")
+        path = f"{self._tmp.name}/run{len(self.spilled)}"
+        np.save(path + ".codes.npy", codes)
+        np.save(path + ".counts.npy", counts)
+        self.spilled.append(path)
+
+    def cleanup(self):
+        if self._tmp is not None:
+            self._tmp.cleanup()
+
+
+def count_kmers_sparse(sequences, k, min_count=1, memory_budget=MEMORY_BUDGET,
+                       spill_dir=None, chunk_size=SPARSE_CHUNK, canonical=False):
+    """Count k-mers (k <= 32) as sorted uint64 codes with int64 counts.
+
+    sequences is one sequence or an iterable of them (e.g. FASTA records);
+    k-mers never span two sequences. Each chunk is sorted and uniqued, and
+    the partial runs are merged. Once the runs exceed memory_budget bytes
+    they are written to spill_dir and merged at the end one code range at a
+    time, so peak memory stays near the budget. Only k-mers seen at least
+    min_count times are returned. canonical=True merges each k-mer with its
+    reverse complement (see kmer_codes).
+    """
+    store = _RunStore(memory_budget, spill_dir)
+    try:
+        for chunk in _iter_sequence_chunks(sequences, k, chunk_size):
+            codes, _ = kmer_codes(chunk, k, canonical)
+            codes, counts = np.unique(codes, return_counts=True)
+            store.add(codes, counts.astype(np.int64))
+        codes, counts = store.collapse_pending()
+        if not store.spilled:
+            keep = counts >= min_count
+            return codes[keep], counts[keep]
+        store.spill(codes, counts)
+        return _merge_spilled(store.spilled, k, min_count, memory_budget)
+    finally:
+        store.cleanup()
+
+
+def _merge_spilled(paths, k, min_count, memory_budget):
+    """Merge sorted on-disk runs partition by partition of the code space."""
+    runs = [
+        (np.load(p + ".codes.npy", mmap_mode="r"), np.load(p + ".counts.npy", mmap_mode="r"))
+        for p in paths
+    ]
+    total = sum(len(codes) for codes, _ in runs)
+    n_parts = max(1, -(-total * _PAIR_BYTES // max(memory_budget, 1)))
+    space = 1 << (2 * k)
+    bounds = [space * i // n_parts for i in range(n_parts)] + [space]
+    out_codes, out_counts = [], []
+    for lo, hi in zip(bounds[:-1], bounds[1:]):
+        part_codes, part_counts = [], []
+        for codes, counts in runs:
+            a = np.searchsorted(codes, np.uint64(lo))
+            b = len(codes) if hi >= space else np.searchsorted(codes, np.uint64(hi))
+            part_codes.append(np.asarray(codes[a:b]))
+            part_counts.append(np.asarray(counts[a:b]))
+        codes, counts = _merge_runs(np.concatenate(part_codes), np.concatenate(part_counts))
+        keep = counts >= min_count
+        out_codes.append(codes[keep])
+        out_counts.append(counts[keep])
+    return np.concatenate(out_codes), np.concatenate(out_counts)
+
+
+def sparse_to_dict(codes, counts, k):
+    return {code_to_kmer(c, k): int(n) for c, n in zip(codes, counts)}
@@ -0,0 +1,118 @@
+"""Six-frame open reading frame search on codon index arrays."""
+
+import numpy as np
+
+from .encoding import BASES, N_CODE, NucleotideArray, as_codes
+
+STOP_CODONS = ("TAA", "TAG", "TGA")
+START_CODONS = ("ATG",)
+ALT_START_CODONS = ("ATG", "GTG", "TTG")  # bacterial/archaeal alternative starts
+MIN_ORF_LENGTH = 75  # nucleotides, stop codon included
+
+ORF_DTYPE = np.dtype([("strand", "i1"), ("frame", "i1"), ("start", "<i8"), ("end", "<i8")])
+
+
+def codon_index(codon):
+    """16 * b1 + 4 * b2 + b3 with A=0, C=1, G=2, T/U=3."""
+    codon = codon.upper().replace("U", "T")
+    return 16 * BASES.index(codon[0]) + 4 * BASES.index(codon[1]) + BASES.index(codon[2])
+
+
+def codon_indices(seq, frame=0):
+    """Index (0-63) of every full codon read from offset frame; -1 where a codon has N.
+
+    The codes are viewed as an (m, 3) array, so no per-codon Python work is done.
+    """
+    codes = as_codes(seq)
+    m = max((len(codes) - frame) // 3, 0)
+    triplets = codes[frame:frame + 3 * m].reshape(m, 3).astype(np.int16)
+    indices = (triplets[:, 0] << 4) | (triplets[:, 1] << 2) | triplets[:, 2]
+    indices[(triplets == N_CODE).any(axis=1)] = -1
+    return indices
+
+
+def _codon_mask(codons):
+    mask = np.zeros(65, dtype=bool)  # slot 64 catches the -1 of N codons
+    mask[[codon_index(c) for c in codons]] = True
+    return mask
+
+
+def _frame_orfs(indices, start_mask, stop_mask, include_partial):
+    """(first codon, codon after the stop) of each ORF in one frame.
+
+    Every stop closes the segment that began after the previous stop; the
+    ORF runs from the first start codon in that segment, so nested starts
+    are never walked twice and each stop yields at most one ORF.
+    """
+    stops = np.flatnonzero(stop_mask[indices])
+    starts = np.flatnonzero(start_mask[indices])
+    ends = stops + 1
+    if include_partial and (len(stops) == 0 or stops[-1] < len(indices) - 1):
+        ends = np.append(ends, len(indices))  # open ORF running off the end
+    segment_starts = np.concatenate([[0], stops + 1])[:len(ends)]
+    first = np.searchsorted(starts, segment_starts)
+    found = first < len(starts)
+    orf_starts, ends = starts[first[found]], ends[found]
+    keep = orf_starts < ends  # a start is never a stop, so this means before the stop
+    return orf_starts[keep], ends[keep]
+
+
+def find_orfs(seq, min_length=MIN_ORF_LENGTH, start_codons=START_CODONS,
+              stop_codons=STOP_CODONS, strands=(1, -1), include_partial=False):
+    """Return ORFs of all six frames as a structured array (see ORF_DTYPE).
+
+    start/end are 0-based, end-exclusive forward-strand coordinates that
+    include the stop codon; frame is the offset (0-2) on the ORF's own
+    strand. Each frame is one pass over its codon indices. ORFs shorter
+    than min_length nucleotides are dropped; include_partial keeps ORFs
+    that reach the sequence end without a stop.
+    """
+    codes = as_codes(seq)
+    n = len(codes)
+    start_mask = _codon_mask(start_codons)
+    stop_mask = _codon_mask(stop_codons)
+    found = []
+    for strand in strands:
+        strand_codes = codes if strand == 1 else NucleotideArray(codes).reverse_complement().codes
+        for frame in range(3):
+            first, after = _frame_orfs(codon_indices(strand_codes, frame), start_mask,
+                                       stop_mask, include_partial)
+            lo, hi = frame + 3 * first, frame + 3 * after
+            keep = hi - lo >= min_length
+            lo, hi = lo[keep], hi[keep]
+            orfs = np.zeros(len(lo), dtype=ORF_DTYPE)
+            orfs["strand"] = strand
+            orfs["frame"] = frame
+            orfs["start"], orfs["end"] = (lo, hi) if strand == 1 else (n - hi, n - lo)
+            found.append(orfs)
+    orfs = np.concatenate(found) if found else np.zeros(0, dtype=ORF_DTYPE)
+    return orfs[np.lexsort((orfs["end"], orfs["start"]))]
+
+
+def orf_sequence(seq, orf):
+    """Nucleotide sequence of one ORF record, read on its own strand."""
+    codes = as_codes(seq)[orf["start"]:orf["end"]]
+    piece = NucleotideArray(codes)
+    return str(piece if orf["strand"] == 1 else piece.reverse_complement())
+
+
+def orf_codon_indices(seq, orfs):
+    """Codon indices of every ORF record, concatenated (stop codons included).
+
+    Each strand/frame is converted to codon indices once and the ORFs are
+    slices of those arrays.
+    """
+    codes = as_codes(seq)
+    n = len(codes)
+    frames = {}
+    parts = []
+    for orf in orfs:
+        strand, frame = int(orf["strand"]), int(orf["frame"])
+        lo, hi = int(orf["start"]), int(orf["end"])
+        if strand == -1:
+            lo, hi = n - hi, n - lo
+        if (strand, frame) not in frames:
+            strand_codes = codes if strand == 1 else NucleotideArray(codes).reverse_complement().codes
+            frames[strand, frame] = codon_indices(strand_codes, frame)
+        parts.append(frames[strand, frame][(lo - frame) // 3:(hi - frame) // 3])
+    return np.concatenate(parts) if parts else np.zeros(0, dtype=np.int16)
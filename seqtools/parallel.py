@@ -0,0 +1,222 @@
+"""Map-reduce symbol counting over line-aligned byte ranges of a FASTA file."""
+
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import groupby
+
+import numpy as np
+
+from .compression import detect_compression
+from .counting import histogram_to_dict, symbol_counts
+from .fasta import read_fasta_pieces
+
+CHUNK_SIZE = 1 << 24
+WHITESPACE = b" \t\n\r\x0b\x0c"  # stripped from both ends of each line by the serial reader
+_IS_WHITESPACE = np.zeros(256, dtype=bool)
+_IS_WHITESPACE[list(WHITESPACE)] = True
+_BLANKS = list(b" \t\x0b\x0c")
+
+
+def split_byte_ranges(filepath, n_ranges, start=0, end=None):
+    """Split a file into about n_ranges (start, end) ranges that begin on line starts.
+
+    start and end limit the split to part of the file (default: all of it).
+    """
+    end = os.path.getsize(filepath) if end is None else end
+    bounds = [start]
+    with open(filepath, "rb") as f:
+        for i in range(1, n_ranges):
+            f.seek(start + (end - start) * i // n_ranges)
+            f.readline()  # move to the start of the next line
+            pos = f.tell()
+            if bounds[-1] < pos < end:
+                bounds.append(pos)
+    bounds.append(end)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def first_record_span(filepath, chunk_size=CHUNK_SIZE):
+    """(start, end) bytes of the first record, from its ">" to the next header.
+
+    Only the header positions are searched for (bytes.find), which is much
+    cheaper than counting; reading stops at the chunk holding the second
+    header.
+    """
+    start = None
+    pos = 0
+    prev = b"\n"  # so a ">" at offset 0 counts as a line start
+    with open(filepath, "rb") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            data = prev + chunk  # data[0] is the byte at pos - 1
+            i = data.find(b"\n>")
+            while i != -1:
+                if start is None:
+                    start = pos + i
+                else:
+                    return start, pos + i
+                i = data.find(b"\n>", i + 1)
+            prev = chunk[-1:]
+            pos += len(chunk)
+    return (pos, pos) if start is None else (start, pos)
+
+
+def _iter_range_chunks(f, start, end, chunk_size):
+    """Yield line-aligned chunks of f between start and end."""
+    f.seek(start)
+    pos = start
+    while pos < end:
+        chunk = f.read(min(chunk_size, end - pos))
+        if not chunk:
+            break
+        if not chunk.endswith(b"\n") and pos + len(chunk) < end:
+            chunk += f.readline()
+        pos += len(chunk)
+        yield chunk
+
+
+def _line_histogram(chunk, start, end):
+    """Byte histogram of the whole lines in chunk[start:end], without the
+    whitespace that line.strip() removes.
+
+    Whitespace inside a line is kept, as the serial reader keeps it. The
+    usual case (only newlines, or CRLF line ends) needs just the histogram;
+    otherwise each whitespace byte is kept when non-blank bytes of the same
+    line lie on both sides of it.
+    """
+    data = np.frombuffer(chunk, dtype=np.uint8, count=end - start, offset=start)
+    histogram = np.bincount(data, minlength=256)
+    cr = histogram[13]
+    if not histogram[_BLANKS].any() and (
+            cr == 0 or cr == chunk.count(b"\r\n", start, end) + chunk.endswith(b"\r", start, end)):
+        histogram[list(WHITESPACE)] = 0
+        return histogram
+    n = len(data)
+    idx = np.arange(n)
+    solid = ~_IS_WHITESPACE[data]
+    newline = data == 10
+    prev_solid = np.maximum.accumulate(np.where(solid, idx, -1))
+    prev_newline = np.maximum.accumulate(np.where(newline, idx, -1))
+    next_solid = np.minimum.accumulate(np.where(solid, idx, n)[::-1])[::-1]
+    next_newline = np.minimum.accumulate(np.where(newline, idx, n)[::-1])[::-1]
+    keep = solid | ((prev_solid > prev_newline) & (next_solid < next_newline))
+    return np.bincount(data[keep], minlength=256)
+
+
+def _serial_counts(histogram):
+    """{symbol: count} as the serial reader sees it: it decodes ASCII with
+    errors="replace", so every byte above 127 is one U+FFFD."""
+    counts = histogram_to_dict(np.concatenate([histogram[:128], np.zeros(128, dtype=np.int64)]))
+    replaced = int(histogram[128:].sum())
+    if replaced:
+        counts["\ufffd"] = replaced
+    return counts
+
+
+def count_range(filepath, start, end, chunk_size=CHUNK_SIZE):
+    """Count sequence symbols in one byte range.
+
+    Returns [(header, histogram), ...] in file order. The first entry has
+    header None and holds the tail of a record that started in an earlier
+    range (it is empty when the range starts on a header line).
+    """
+    segments = [[None, np.zeros(256, dtype=np.int64)]]
+    with open(filepath, "rb") as f:
+        for chunk in _iter_range_chunks(f, start, end, chunk_size):
+            pos = 0
+            n = len(chunk)
+            while pos < n:
+                if chunk[pos] == 62:  # ">" at a line start
+                    eol = chunk.find(b"\n", pos)
+                    eol = n if eol == -1 else eol
+                    header = chunk[pos + 1:eol].strip().decode("ascii", errors="replace")
+                    segments.append([header, np.zeros(256, dtype=np.int64)])
+                    pos = eol + 1
+                    continue
+                nxt = chunk.find(b"\n>", pos)
+                stop = n if nxt == -1 else nxt + 1
+                segments[-1][1] += _line_histogram(chunk, pos, stop)
+                pos = stop
+    return [(header, histogram) for header, histogram in segments]
+
+
+def _count_range_job(args):
+    return count_range(*args)
+
+
+def merge_ranges(results):
+    """Join per-range segments into one (header, histogram) per record."""
+    records = []
+    for segments in results:
+        for header, histogram in segments:
+            if header is None:
+                if records:  # bytes before the first header are ignored
+                    records[-1][1] += histogram
+            else:
+                records.append([header, histogram.copy()])
+    return [(header, histogram) for header, histogram in records]
+
+
+def run_jobs(jobs, workers, progress, func=_count_range_job):
+    """Run func(job) for every job (count_range by default), results in job order.
+
+    With more than one worker, func and the jobs must be picklable (func a
+    module-level function). progress(jobs_done, n_jobs) is called as jobs
+    finish.
+    """
+    if workers == 1 or len(jobs) == 1:
+        results = []
+        for job in jobs:
+            results.append(func(job))
+            if progress is not None:
+                progress(len(results), len(jobs))
+        return results
+    results = [None] * len(jobs)
+    pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        futures = {pool.submit(func, job): i for i, job in enumerate(jobs)}
+        for done, future in enumerate(as_completed(futures), 1):
+            results[futures[future]] = future.result()
+            if progress is not None:
+                progress(done, len(jobs))
+    except BaseException:
+        pool.shutdown(wait=False, cancel_futures=True)
+        raise
+    pool.shutdown()
+    return results
+
+
+def parallel_symbol_counts(filepath, workers=None, n_ranges=None, progress=None,
+                           first_record_only=False):
+    """Count symbols per record and in total using a process pool.
+
+    Returns ([(header, {symbol: count}), ...], {symbol: count}); the result
+    is identical to counting read_fasta_records serially. Compressed files
+    cannot be split by byte offset and are counted serially.
+    first_record_only=True restricts the byte ranges to the first record's
+    span, so the rest of a multi-record file is never read.
+    """
+    workers = workers or os.cpu_count() or 1
+    if detect_compression(filepath):
+        # streamed piece by piece, so no record is ever joined in memory
+        records = []
+        pieces = read_fasta_pieces(filepath, progress=progress)
+        for header, group in groupby(pieces, key=lambda piece: piece[0]):
+            records.append((header, symbol_counts(
+                piece.decode("ascii", errors="replace") for _, piece in group)))
+            if first_record_only:
+                break
+    else:
+        start, end = first_record_span(filepath) if first_record_only else (0, None)
+        ranges = split_byte_ranges(filepath, n_ranges or workers * 4, start, end)
+        jobs = [(filepath, start, end) for start, end in ranges]
+        records = [(header, _serial_counts(histogram))
+                   for header, histogram in merge_ranges(run_jobs(jobs, workers, progress))]
+
+    total = Counter()
+    for _, counts in records:
+        total.update(counts)
+    return records, dict(total)
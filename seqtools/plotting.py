@@ -0,0 +1,103 @@
+"""Level-of-detail line plots: decimate long series to the axes' pixel width."""
+
+from bisect import bisect_left, bisect_right
+
+import numpy as np
+
+CHUNK_POINTS = 1 << 22  # points of y copied at a time when blocks are reduced
+
+
+def minmax_decimate(x, y, n_bins):
+    """Keep the first, last, minimum and maximum point of each of n_bins bins.
+
+    Every peak and trough survives, so the drawn envelope is what the full
+    series would look like at this resolution. Bins are reduced a chunk at
+    a time, so memory-mapped or strided inputs are never copied whole.
+    """
+    x = np.asarray(x)
+    y = np.asarray(y)
+    n = len(y)
+    if n <= 2 * n_bins:
+        return x, y
+    size = -(-n // n_bins)
+    m = n // size * size
+    keep = [[0, n - 1]]
+    chunk = size * max(CHUNK_POINTS // size, 1)
+    for lo in range(0, m, chunk):
+        blocks = np.ascontiguousarray(y[lo:min(lo + chunk, m)]).reshape(-1, size)
+        offsets = np.arange(lo, lo + blocks.size, size)
+        keep += [offsets + blocks.argmin(axis=1), offsets + blocks.argmax(axis=1)]
+    if m < n:
+        keep.append([m + np.argmin(y[m:]), m + np.argmax(y[m:])])
+    idx = np.unique(np.concatenate(keep))
+    return x[idx], y[idx]
+
+
+def lttb(x, y, n_out):
+    """Largest-Triangle-Three-Buckets downsampling to n_out points.
+
+    Each bucket keeps the point that forms the largest triangle with the
+    previously kept point and the mean of the next bucket, which follows
+    the visual shape of the series better than striding.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return x, y
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    edges = np.append(edges, n)
+    idx = np.empty(n_out, dtype=np.int64)
+    idx[0], idx[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], max(edges[i + 1], edges[i] + 1)
+        nlo, nhi = hi, max(edges[i + 2], hi + 1)
+        avg_x, avg_y = x[nlo:nhi].mean(), y[nlo:nhi].mean()
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(np.argmax(area))
+        idx[i + 1] = a
+    return x[idx], y[idx]
+
+
+_METHODS = {"minmax": minmax_decimate, "lttb": lttb}
+
+
+class DecimatedLine:
+    """A Line2D that redraws a decimated copy of (x, y) for the visible range.
+
+    x must be sorted. The full arrays are kept (memory maps stay memory
+    maps); on every zoom or pan (xlim_changed) the visible slice, found by
+    bisection, is decimated again to about one point per pixel column, so
+    detail reappears as the user zooms in.
+    """
+
+    def __init__(self, ax, x, y, method="minmax", points_per_pixel=1, **kwargs):
+        self.ax = ax
+        self.x = np.asarray(x)
+        self.y = np.asarray(y)
+        self.decimate = _METHODS[method]
+        self.points_per_pixel = points_per_pixel
+        xs, ys = self._visible(self.x[0], self.x[-1]) if len(self.x) else (self.x, self.y)
+        (self.line,) = ax.plot(xs, ys, **kwargs)
+        ax.callbacks.connect("xlim_changed", self._on_xlim)
+
+    def _target(self):
+        width = self.ax.bbox.width or 1000
+        return max(int(width * self.points_per_pixel), 3)
+
+    def _visible(self, lo, hi):
+        # bisect reads O(log n) items; np.searchsorted would copy a strided x
+        a = max(bisect_left(self.x, lo) - 1, 0)
+        b = min(bisect_right(self.x, hi) + 1, len(self.x))
+        return self.decimate(self.x[a:b], self.y[a:b], self._target())
+
+    def _on_xlim(self, ax):
+        lo, hi = sorted(ax.get_xlim())
+        self.line.set_data(*self._visible(lo, hi))
+        ax.figure.canvas.draw_idle()
+
+
+def plot_decimated(ax, x, y, method="minmax", **kwargs):
+    """ax.plot(x, y, **kwargs) for long series; returns the DecimatedLine."""
+    return DecimatedLine(ax, x, y, method, **kwargs)
@@ -0,0 +1,130 @@
+"""Primer/probe candidate search over every window in a length range."""
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .encoding import N_CODE, as_codes, decode
+from .kmers import rolling_codes
+from .tm import default_na, nn_tm_profile, salt_tm, wallace_tm
+from .windows import window_sums
+
+BLOCK_SIZE = 1 << 20  # window starts scanned per block
+PRIMER_COLUMNS = ("start", "end", "length", "tm", "gc", "score", "sequence")
+
+
+def _window_tm(codes, length, method, Na):
+    if method == 3:
+        return nn_tm_profile(codes, length, Na)[1]
+    _, gc = window_sums((codes == 1) | (codes == 2), length)
+    if method == 1:
+        _, at = window_sums((codes == 0) | (codes == 3), length)
+        return wallace_tm(gc, at)
+    if method == 2:
+        return salt_tm(gc, length, Na)
+    raise ValueError("Method must be 1, 2 or 3.")
+
+
+def _homopolymer_starts(codes, max_run):
+    """True at i where codes[i:i + max_run + 1] is a single repeated base."""
+    same = codes[1:] == codes[:-1]
+    _, run = window_sums(same, max_run)
+    return np.concatenate([run == max_run, np.zeros(max_run, dtype=bool)])
+
+
+def _three_prime_dimer(fwd, rc, starts, length, k):
+    """True where the reverse complement of the 3' k-mer occurs in the primer.
+
+    That k-mer can then anneal to the primer itself (hairpin) or to a
+    second copy (primer dimer) with an extendable 3' end.
+    """
+    if len(starts) == 0:
+        return np.zeros(0, dtype=bool)
+    tails = rc[starts + length - k]
+    hit = np.zeros(len(starts), dtype=bool)
+    for i in range(0, len(starts), 1 << 16):
+        block = sliding_window_view(fwd, length - k + 1)[starts[i:i + (1 << 16)]]
+        hit[i:i + (1 << 16)] = (block == tails[i:i + (1 << 16), None]).any(axis=1)
+    return hit
+
+
+def iter_primer_candidates(seq, min_len=18, max_len=30, tm_range=(52.0, 65.0),
+                           gc_range=(40.0, 60.0), gc_clamp=True, max_homopolymer=4,
+                           self_comp_k=4, method=3, Na=None, block_size=BLOCK_SIZE):
+    """Yield columnar batches (see PRIMER_COLUMNS) of forward-strand candidates.
+
+    Each primer length is scanned over a block of window starts at once and
+    filtered with boolean masks: Tm inside tm_range, GC% inside gc_range,
+    a 3' GC clamp (last base G/C, at most 3 G/C in the last 5), no run of
+    more than max_homopolymer identical bases, and no 3' self-complementary
+    self_comp_k-mer. The expensive self-complementarity test only runs on
+    windows that passed the others. score is |Tm - mid(tm_range)| +
+    0.1 |GC% - 50|; lower is better. Windows with non-ACGT bases are skipped.
+    Starts are 1-based and memory is bounded by block_size. Na defaults per
+    method (see tm.default_na).
+    """
+    Na = default_na(method, Na)
+    codes = as_codes(seq)
+    tm_target = sum(tm_range) / 2
+    for block_start in range(0, max(len(codes) - min_len + 1, 0), block_size):
+        block = codes[block_start:block_start + block_size + max_len - 1]
+        n_starts = min(block_size, len(codes) - block_start)
+        is_gc = (block == 1) | (block == 2)
+        long_run = _homopolymer_starts(block, max_homopolymer)
+        gc_prefix = np.concatenate([[0], np.cumsum(is_gc)])
+        if self_comp_k:
+            fwd, rc = rolling_codes(block, self_comp_k)
+        for length in range(min_len, max_len + 1):
+            starts, gc = window_sums(is_gc, length)
+            starts, gc = starts[:n_starts], gc[:n_starts]
+            if len(starts) == 0:
+                break
+            gc_percent = 100.0 * gc / length
+            tm = _window_tm(block, length, method, Na)[:len(starts)]
+            _, bad = window_sums(block == N_CODE, length)
+            keep = (bad[:len(starts)] == 0) & (tm >= tm_range[0]) & (tm <= tm_range[1])
+            keep &= (gc_percent >= gc_range[0]) & (gc_percent <= gc_range[1])
+            if length > max_homopolymer:
+                _, runs = window_sums(long_run, length - max_homopolymer)
+                keep &= runs[:len(starts)] == 0
+            if gc_clamp:
+                ends = starts + length
+                keep &= is_gc[ends - 1] & (gc_prefix[ends] - gc_prefix[ends - 5] <= 3)
+            hits = np.flatnonzero(keep)
+            if self_comp_k:
+                hits = hits[~_three_prime_dimer(fwd, rc, starts[hits], length, self_comp_k)]
+            if len(hits) == 0:
+                continue
+            yield {
+                "start": block_start + starts[hits] + 1,
+                "end": block_start + starts[hits] + length,
+                "length": np.full(len(hits), length),
+                "tm": tm[hits],
+                "gc": gc_percent[hits],
+                "score": np.abs(tm[hits] - tm_target) + 0.1 * np.abs(gc_percent[hits] - 50),
+                "sequence": [decode(block[s:s + length]) for s in starts[hits].tolist()],
+            }
+
+
+def top_primers(batches, n=10):
+    """Keep the n best-scoring rows of a stream of batches, best first."""
+    best = None
+    for batch in batches:
+        if best is not None:
+            batch = {c: np.concatenate([best[c], batch[c]]) for c in PRIMER_COLUMNS}
+        order = np.argsort(batch["score"], kind="stable")[:n]
+        best = {c: np.asarray(batch[c])[order] for c in PRIMER_COLUMNS}
+    return best or {c: np.zeros(0) for c in PRIMER_COLUMNS}
+
+
+def write_primer_table(batches, f):
+    """Write batches to f as tab-separated rows while passing them through.
+
+    Rows reach the file as soon as each batch is produced, so the full
+    candidate list never has to be held; chain with top_primers to rank.
+    """
+    f.write("\t".join(PRIMER_COLUMNS) + "\n")
+    for batch in batches:
+        for row in zip(*(batch[c] for c in PRIMER_COLUMNS)):
+            start, end, length, tm, gc, score, sequence = row
+            f.write(f"{start}\t{end}\t{length}\t{tm:.2f}\t{gc:.1f}\t{score:.3f}\t{sequence}\n")
+        yield batch
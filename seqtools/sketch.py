@@ -0,0 +1,142 @@
+"""Fixed-memory heavy-hitter k-mers: Count-Min sketch plus a Space-Saving table."""
+
+import heapq
+
+import numpy as np
+
+from .kmers import code_to_kmer, kmer_codes
+
+_FMIX1 = np.uint64(0xBF58476D1CE4E5B9)
+_FMIX2 = np.uint64(0x94D049BB133111EB)
+
+
+def splitmix64(keys, seed):
+    """splitmix64 finalizer of keys + seed: every output bit depends on every key bit.
+
+    2-bit k-mer codes keep their first bases in the high bits, so a plain
+    multiply-and-modulo would ignore them for k above about 24.
+    """
+    with np.errstate(over="ignore"):
+        h = keys + seed
+        h = (h ^ (h >> np.uint64(30))) * _FMIX1
+        h = (h ^ (h >> np.uint64(27))) * _FMIX2
+    return h ^ (h >> np.uint64(31))
+
+
+class CountMinSketch:
+    """Count-Min sketch over uint64 keys.
+
+    Estimates never undercount; with width w and depth d the overcount is
+    at most e/w * total with probability 1 - exp(-d).
+    """
+
+    def __init__(self, width=1 << 20, depth=4, seed=0):
+        self.width = width
+        self.depth = depth
+        self.table = np.zeros((depth, width), dtype=np.int64)
+        rng = np.random.default_rng(seed)
+        self.salts = rng.integers(1, 2 ** 63, size=depth, dtype=np.uint64)
+        self.total = 0
+
+    def _rows(self, keys):
+        keys = np.asarray(keys, dtype=np.uint64)
+        for row, salt in enumerate(self.salts):
+            yield row, (splitmix64(keys, salt) % np.uint64(self.width)).astype(np.int64)
+
+    def add(self, keys, counts=None):
+        keys = np.asarray(keys, dtype=np.uint64)
+        if counts is None:
+            keys, counts = np.unique(keys, return_counts=True)
+        for row, idx in self._rows(keys):
+            np.add.at(self.table[row], idx, counts)
+        self.total += int(np.sum(counts))
+
+    def estimate(self, keys):
+        estimates = None
+        for row, idx in self._rows(keys):
+            values = self.table[row][idx]
+            estimates = values if estimates is None else np.minimum(estimates, values)
+        return estimates
+
+    def error_bound(self):
+        """Additive overcount bound (e/w * total) and the probability it holds."""
+        return np.e / self.width * self.total, 1 - np.exp(-self.depth)
+
+
+class HeavyHitters:
+    """Top-N k-mers over an unbounded stream in fixed memory.
+
+    Every k-mer updates a Count-Min sketch. A Space-Saving style table of
+    `capacity` candidates, ordered by a lazy min-heap, keeps the k-mers
+    with the largest sketch estimates: a k-mer whose estimate beats the
+    current minimum evicts it. Because counts live in the sketch, an
+    evicted k-mer that comes back re-enters with its full history.
+    """
+
+    def __init__(self, k, capacity=1000, width=1 << 20, depth=4, canonical=False):
+        self.k = k
+        self.capacity = capacity
+        self.canonical = canonical
+        self.sketch = CountMinSketch(width, depth)
+        self.candidates = {}  # code -> sketch estimate at its last occurrence
+        self._heap = []  # (estimate, code), may hold stale entries
+
+    def _minimum(self):
+        while self._heap:
+            estimate, key = self._heap[0]
+            if self.candidates.get(key) == estimate:
+                return estimate
+            heapq.heappop(self._heap)
+        return 0
+
+    def _set(self, key, estimate):
+        self.candidates[key] = estimate
+        heapq.heappush(self._heap, (estimate, key))
+        if len(self._heap) > 4 * self.capacity:
+            self._heap = [(v, c) for c, v in self.candidates.items()]
+            heapq.heapify(self._heap)
+
+    def update(self, seq):
+        codes, _ = kmer_codes(seq, self.k, self.canonical)
+        if len(codes) == 0:
+            return
+        keys, counts = np.unique(codes, return_counts=True)
+        self.sketch.add(keys, counts)
+        estimates = self.sketch.estimate(keys)
+        if len(self.candidates) >= self.capacity:
+            # only k-mers that can beat the table minimum need Python-level work
+            keep = estimates > self._minimum()
+            keys, estimates = keys[keep], estimates[keep]
+        for key, estimate in zip(keys.tolist(), estimates.tolist()):
+            if key in self.candidates or len(self.candidates) < self.capacity:
+                self._set(key, estimate)
+            elif estimate > self._minimum():
+                _, victim = heapq.heappop(self._heap)
+                del self.candidates[victim]
+                self._set(key, estimate)
+
+    def top(self, n=10):
+        """Return [(kmer, estimate, lower_bound)] for the n heaviest k-mers.
+
+        estimate never undercounts; lower_bound subtracts the sketch's
+        additive error bound (see CountMinSketch.error_bound).
+        """
+        if not self.candidates:
+            return []
+        keys = np.fromiter(self.candidates, dtype=np.uint64, count=len(self.candidates))
+        estimates = self.sketch.estimate(keys)
+        error, _ = self.sketch.error_bound()
+        best = heapq.nlargest(n, zip(estimates.tolist(), keys.tolist()))
+        return [
+            (code_to_kmer(key, self.k), estimate, max(int(estimate - error), 0))
+            for estimate, key in best
+        ]
+
+
+def stream_heavy_hitters(sequences, k, top_n=10, capacity=None, width=1 << 20,
+                         depth=4, canonical=False):
+    """Top-N k-mers of an iterable of sequences plus the sketch's (error, probability) bound."""
+    hh = HeavyHitters(k, capacity or max(100 * top_n, 1000), width, depth, canonical)
+    for seq in sequences:
+        hh.update(seq)
+    return hh.top(top_n), hh.sketch.error_bound()
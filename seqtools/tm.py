@@ -0,0 +1,138 @@
+"""Vectorized melting-temperature profiles over sliding windows."""
+
+import numpy as np
+
+from .encoding import N_CODE, as_codes
+from .kmers import MAX_PACKED_K, rolling_codes
+from .windows import _as_byte_array, window_sums
+
+_GC = np.zeros(256, dtype=bool)
+_AT = np.zeros(256, dtype=bool)
+_GC[list(b"GCgc")] = True
+_AT[list(b"ATUatu")] = True
+
+
+def wallace_tm(gc, at):
+    """Method 1: 4(G + C) + 2(A + T), on scalars or arrays of counts."""
+    return 4 * gc + 2 * at
+
+
+SALT_NA = 0.0001  # Na (M) of the GC%/salt formula, as in lab3
+
+
+def default_na(method, Na=None):
+    """Na if given, else the salt each method is calibrated for (NN_NA for method 3)."""
+    if Na is not None:
+        return Na
+    return NN_NA if method == 3 else SALT_NA
+
+
+def salt_tm(gc, length, Na=SALT_NA):
+    """Method 2: the GC%/salt formula, written as in lab3's calculate_tm."""
+    gc_percent = gc / length * 100
+    return -(81.5 + 16.6 * np.log10(Na) + 0.41 * (gc_percent / 100) - (600 / length))
+
+
+def tm_profile(seq, window_size=8, method=2, Na=None, step=1, with_windows=False):
+    """Tm of every window as columns {"start", "end", "tm"} (1-based, inclusive).
+
+    G+C and A+T per window come from two prefix sums, so the whole profile
+    is a handful of array operations whatever its length. with_windows=True
+    adds a "window" list holding each window's sequence. Na defaults per
+    method (see default_na), so method 3 agrees with nn_tm.
+    """
+    Na = default_na(method, Na)
+    data = _as_byte_array(seq)
+    starts, gc = window_sums(_GC[data], window_size, step)
+    if method == 1:
+        _, at = window_sums(_AT[data], window_size, step)
+        tm = wallace_tm(gc, at)
+    elif method == 2:
+        tm = salt_tm(gc, window_size, Na)
+    elif method == 3:
+        _, tm = nn_tm_profile(seq, window_size, Na, step=step)
+    else:
+        raise ValueError("Method must be 1, 2 or 3.")
+    profile = {"start": starts + 1, "end": starts + window_size, "tm": tm}
+    if with_windows:
+        text = data.tobytes().decode("latin-1")
+        profile["window"] = [text[s:s + window_size] for s in starts.tolist()]
+    return profile
+
+
+# SantaLucia (1998) unified nearest-neighbor parameters, indexed by the
+# 2-bit code of the top-strand dinucleotide (A=0, C=1, G=2, T=3):
+# delta H in kcal/mol, delta S in cal/(K mol).
+_NN_PARAMS = {
+    "AA": (-7.9, -22.2), "TT": (-7.9, -22.2),
+    "AT": (-7.2, -20.4), "TA": (-7.2, -21.3),
+    "CA": (-8.5, -22.7), "TG": (-8.5, -22.7),
+    "GT": (-8.4, -22.4), "AC": (-8.4, -22.4),
+    "CT": (-7.8, -21.0), "AG": (-7.8, -21.0),
+    "GA": (-8.2, -22.2), "TC": (-8.2, -22.2),
+    "CG": (-10.6, -27.2), "GC": (-9.8, -24.4),
+    "GG": (-8.0, -19.9), "CC": (-8.0, -19.9),
+}
+_NN_DH = np.zeros(16)
+_NN_DS = np.zeros(16)
+for _pair, (_dh, _ds) in _NN_PARAMS.items():
+    _i = 4 * "ACGT".index(_pair[0]) + "ACGT".index(_pair[1])
+    _NN_DH[_i], _NN_DS[_i] = _dh, _ds
+
+# Initiation per duplex end, by terminal base: G/C end, A/T end
+_INIT_DH = np.array([2.3, 0.1, 0.1, 2.3, 0.0])
+_INIT_DS = np.array([4.1, -2.8, -2.8, 4.1, 0.0])
+_SYMMETRY_DS = -1.4
+_R = 1.987  # cal/(K mol)
+
+PRIMER_CONC = 250e-9  # total strand concentration (M)
+NN_NA = 0.05  # 50 mM monovalent salt
+
+
+def _self_complementary(bases, starts, window_size):
+    """True where the window equals its own reverse complement."""
+    k = min(window_size, MAX_PACKED_K)
+    fwd, rc = rolling_codes(bases, k)
+    # first k bases against the reverse complement of the last k bases
+    hit = fwd[starts] == rc[starts + window_size - k]
+    if window_size > k:
+        for i in np.flatnonzero(hit):
+            w = bases[starts[i]:starts[i] + window_size]
+            hit[i] = np.array_equal(w, 3 - w[::-1])
+    return hit
+
+
+def nn_tm_profile(seq, window_size, Na=NN_NA, conc=PRIMER_CONC, step=1):
+    """Nearest-neighbor Tm (SantaLucia 1998) of every window: (starts, tm).
+
+    delta H and delta S of each dinucleotide step are prefix-summed once,
+    so each window costs two subtractions plus its two end terms, as in
+    the GC-count methods. Salt correction is 0.368 (N - 1) ln[Na+] on
+    delta S; conc is the total strand concentration (C_T / 4, or C_T for
+    self-complementary windows). Windows with non-ACGT bases give NaN.
+    """
+    if window_size < 2:
+        raise ValueError("Nearest-neighbor Tm needs at least 2 bases")
+    bases = as_codes(seq)
+    pairs = 4 * (bases[:-1] & 3).astype(np.int64) + (bases[1:] & 3)
+    starts, dh = window_sums(_NN_DH[pairs], window_size - 1, step)
+    _, ds = window_sums(_NN_DS[pairs], window_size - 1, step)
+    if len(starts) == 0:
+        return starts, np.zeros(0)
+    first, last = bases[starts], bases[starts + window_size - 1]
+    dh = dh + _INIT_DH[first] + _INIT_DH[last]
+    ds = ds + _INIT_DS[first] + _INIT_DS[last]
+    ds = ds + 0.368 * (window_size - 1) * np.log(Na)
+    symmetric = _self_complementary(bases, starts, window_size)
+    ds = ds + np.where(symmetric, _SYMMETRY_DS, 0.0)
+    x = np.where(symmetric, 1.0, 4.0)
+    tm = 1000 * dh / (ds + _R * np.log(conc / x)) - 273.15
+    _, bad = window_sums(bases == N_CODE, window_size, step)
+    tm[bad > 0] = np.nan
+    return starts, tm
+
+
+def nn_tm(seq, Na=NN_NA, conc=PRIMER_CONC):
+    """Nearest-neighbor Tm of one sequence (NaN if it holds non-ACGT bases)."""
+    _, tm = nn_tm_profile(seq, len(as_codes(seq)), Na, conc)
+    return float(tm[0])
@@ -0,0 +1,124 @@
+"""Constant-memory window tracks (Tm and composition) written to a binary file."""
+
+import json
+from bisect import bisect_left
+
+import numpy as np
+
+from .fasta import CHUNK_SIZE, read_fasta_pieces
+from .tm import default_na, tm_profile
+from .windows import sliding_window_counts
+
+TRACK_BASES = "ACGT"
+
+
+def track_dtype():
+    """One row per window: record index, 1-based start, Tm, GC% and base counts."""
+    fields = [("record", "<u4"), ("start", "<u8"), ("tm", "<f4"), ("gc", "<f4")]
+    fields += [(base, "<u4") for base in TRACK_BASES] + [("N", "<u4")]
+    return np.dtype(fields)
+
+
+def _window_rows(buffer, offset, window_size, step, method, Na):
+    profile = tm_profile(buffer, window_size, method, Na, step)
+    starts, counts = sliding_window_counts(buffer, window_size, step, TRACK_BASES)
+    rows = np.zeros(len(starts), dtype=track_dtype())
+    rows["start"] = offset + starts + 1
+    rows["tm"] = profile["tm"]
+    rows["gc"] = 100.0 * (counts["G"] + counts["C"]) / window_size
+    for base in TRACK_BASES:
+        rows[base] = counts[base]
+    rows["N"] = window_size - sum(counts[base] for base in TRACK_BASES)
+    return rows
+
+
+def iter_track_rows(pieces, window_size=8, step=1, method=2, Na=None):
+    """Yield (header, rows) batches from (header, bytes) sequence pieces.
+
+    Each piece is joined to the tail of the previous one, so a window that
+    straddles two pieces is computed once and nothing beyond one piece plus
+    window_size - 1 bases is held in memory. Rows match tm_profile and
+    sliding_window_counts run on the whole record. The "record" column is
+    left at 0 for TrackWriter to fill in.
+    """
+    Na = default_na(method, Na)
+    header = None
+    buffer = b""
+    offset = 0  # position of buffer[0] in the record, always a multiple of step
+    skip = 0  # bases to drop before the next window start when step > window_size
+    for piece_header, piece in pieces:
+        if piece_header != header:
+            header = piece_header
+            buffer = b""
+            offset = skip = 0
+        dropped = min(skip, len(piece))
+        skip -= dropped
+        buffer += piece[dropped:].upper()
+        n_windows = len(buffer) - window_size + 1
+        if n_windows <= 0:
+            continue
+        yield header, _window_rows(buffer, offset, window_size, step, method, Na)
+        next_start = -(-n_windows // step) * step
+        skip = max(next_start - len(buffer), 0)
+        buffer = buffer[next_start:]
+        offset += next_start
+
+
+class TrackWriter:
+    """Append window rows to path; metadata goes to path + ".json" on close.
+
+    The "record" column indexes meta["records"], the headers in file order.
+    """
+
+    def __init__(self, path, **params):
+        self.path = path
+        self.params = params
+        self.records = []
+        self.rows = 0
+        self._f = open(path, "wb")
+
+    def write(self, header, rows):
+        if not self.records or self.records[-1] != header:
+            self.records.append(header)
+        rows["record"] = len(self.records) - 1
+        rows.tofile(self._f)
+        self.rows += len(rows)
+
+    def close(self):
+        self._f.close()
+        meta = dict(self.params, records=self.records, rows=self.rows,
+                    dtype=track_dtype().descr)
+        with open(self.path + ".json", "w") as f:
+            json.dump(meta, f)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def write_fasta_track(filepath, out_path, window_size=8, step=1, method=2, Na=None,
+                      piece_size=CHUNK_SIZE, progress=None):
+    """Stream every record of a FASTA file into a binary track; returns the row count."""
+    Na = default_na(method, Na)
+    pieces = read_fasta_pieces(filepath, piece_size, progress=progress)
+    with TrackWriter(out_path, window_size=window_size, step=step, method=method, Na=Na) as writer:
+        for header, rows in iter_track_rows(pieces, window_size, step, method, Na):
+            writer.write(header, rows)
+    return writer.rows
+
+
+def read_track(path):
+    """Return (rows, meta); rows is a read-only memmap, so nothing is loaded up front."""
+    with open(path + ".json") as f:
+        meta = json.load(f)
+    if meta["rows"] == 0:
+        return np.zeros(0, dtype=track_dtype()), meta
+    return np.memmap(path, dtype=track_dtype(), mode="r"), meta
+
+
+def track_record(rows, index):
+    """Rows of record index as a view; the record column is bisected, not copied."""
+    records = rows["record"]
+    return rows[bisect_left(records, index):bisect_left(records, index + 1)]
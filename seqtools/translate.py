@@ -0,0 +1,159 @@
+"""Codon translation through 64-entry lookup arrays (NCBI genetic codes)."""
+
+import numpy as np
+
+from .encoding import BASES, NucleotideArray, as_codes
+from .fasta import read_fasta_records
+from .orfs import MIN_ORF_LENGTH, codon_indices, find_orfs
+
+# NCBI translation tables as published: amino acid of each codon with the
+# bases ordered T, C, A, G (TTT, TTC, TTA, TTG, TCT, ...). Tables 27, 28
+# and 31, whose stops depend on context, are left out.
+NCBI_TABLES = {
+    1: "FFLLSSSSYY**CC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+    2: "FFLLSSSSYY**CCWWLLLLPPPPHHQQRRRRIIMMTTTTNNKKSS**VVVVAAAADDEEGGGG",
+    3: "FFLLSSSSYY**CCWWTTTTPPPPHHQQRRRRIIMMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+    4: "FFLLSSSSYY**CCWWLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+    5: "FFLLSSSSYY**CCWWLLLLPPPPHHQQRRRRIIMMTTTTNNKKSSSSVVVVAAAADDEEGGGG",
+    6: "FFLLSSSSYYQQCC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+    9: "FFLLSSSSYY**CCWWLLLLPPPPHHQQRRRRIIIMTTTTNNNKSSSSVVVVAAAADDEEGGGG",
+    10: "FFLLSSSSYY**CCCWLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+    11: "FFLLSSSSYY**CC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+    12: "FFLLSSSSYY**CC*WLLLSPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+    13: "FFLLSSSSYY**CCWWLLLLPPPPHHQQRRRRIIMMTTTTNNKKSSGGVVVVAAAADDEEGGGG",
+    14: "FFLLSSSSYYY*CCWWLLLLPPPPHHQQRRRRIIIMTTTTNNNKSSSSVVVVAAAADDEEGGGG",
+    16: "FFLLSSSSYY*LCC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+    21: "FFLLSSSSYY**CCWWLLLLPPPPHHQQRRRRIIMMTTTTNNNKSSSSVVVVAAAADDEEGGGG",
+    22: "FFLLSS*SYY*LCC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+    23: "FF*LSSSSYY**CC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+    24: "FFLLSSSSYY**CCWWLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSSKVVVVAAAADDEEGGGG",
+    25: "FFLLSSSSYY**CCGWLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+    26: "FFLLSSSSYY**CC*WLLLAPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+    29: "FFLLSSSSYYYYCC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+    30: "FFLLSSSSYYEECC*WLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG",
+    33: "FFLLSSSSYYY*CCWWLLLLPPPPHHQQRRRRIIIMTTTTNNKKSSSKVVVVAAAADDEEGGGG",
+}
+
+THREE_LETTER = {
+    "A": "Ala", "R": "Arg", "N": "Asn", "D": "Asp", "C": "Cys", "Q": "Gln",
+    "E": "Glu", "G": "Gly", "H": "His", "I": "Ile", "L": "Leu", "K": "Lys",
+    "M": "Met", "F": "Phe", "P": "Pro", "S": "Ser", "T": "Thr", "W": "Trp",
+    "Y": "Tyr", "V": "Val", "*": "Stop", "X": "?",
+}
+
+
+def _compile(table):
+    """Reorder an NCBI string to codon_indices order (A, C, G, T); slot 64 is X.
+
+    codon_indices marks codons with N as -1, which indexes that last slot.
+    """
+    ncbi_order = "TCAG"
+    lookup = np.full(65, ord("X"), dtype=np.uint8)
+    for i, b1 in enumerate(BASES):
+        for j, b2 in enumerate(BASES):
+            for k, b3 in enumerate(BASES):
+                ncbi = 16 * ncbi_order.index(b1) + 4 * ncbi_order.index(b2) + ncbi_order.index(b3)
+                lookup[16 * i + 4 * j + k] = ord(table[ncbi])
+    return lookup
+
+
+CODON_TABLES = {table_id: _compile(table) for table_id, table in NCBI_TABLES.items()}
+
+
+def codon_table(table=1):
+    """Lookup array for an NCBI table id (or an already compiled array)."""
+    if isinstance(table, np.ndarray):
+        return table
+    try:
+        return CODON_TABLES[table]
+    except KeyError:
+        raise ValueError(f"Unknown genetic code table {table}") from None
+
+
+def translate_indices(indices, table=1):
+    """One-letter protein string for an array of codon indices (one np.take)."""
+    return np.take(codon_table(table), indices).tobytes().decode("ascii")
+
+
+def translate(seq, table=1, frame=0, to_stop=False):
+    """Translate seq from offset frame with one-letter codes ('*' stop, 'X' for N).
+
+    to_stop=True cuts the protein before the first stop codon.
+    """
+    protein = translate_indices(codon_indices(seq, frame), table)
+    return protein.split("*", 1)[0] if to_stop else protein
+
+
+def six_frames(seq, table=1):
+    """{(strand, frame): protein} for frames 0-2 of both strands."""
+    codes = as_codes(seq)
+    strands = {1: codes, -1: NucleotideArray(codes).reverse_complement().codes}
+    return {
+        (strand, frame): translate(strand_codes, table, frame)
+        for strand, strand_codes in strands.items()
+        for frame in range(3)
+    }
+
+
+def translate_orfs(seq, orfs, table=1, frames=None):
+    """Proteins of ORF records (see orfs.find_orfs), stop codon removed.
+
+    Each of the six frames is translated once and every ORF is a slice of
+    its frame's protein, so millions of ORFs cost six takes plus slicing.
+    Pass frames (from six_frames) to reuse translations.
+    """
+    frames = frames or six_frames(seq, table)
+    n = len(as_codes(seq))
+    proteins = []
+    for orf in orfs:
+        strand, frame = int(orf["strand"]), int(orf["frame"])
+        lo, hi = int(orf["start"]), int(orf["end"])
+        if strand == -1:
+            lo, hi = n - hi, n - lo
+        protein = frames[(strand, frame)][(lo - frame) // 3:(hi - frame) // 3]
+        proteins.append(protein[:-1] if protein.endswith("*") else protein)
+    return proteins
+
+
+def to_three_letter(protein, sep=""):
+    return sep.join(THREE_LETTER.get(aa, "?") for aa in protein)
+
+
+def iter_proteins(records, mode="orfs", table=1, min_length=MIN_ORF_LENGTH, **orf_options):
+    """Yield (header, protein) for (name, sequence) records, one record at a time.
+
+    mode="frames" gives the six frame translations; mode="orfs" gives the
+    protein of every ORF found by orfs.find_orfs (orf_options are passed on).
+    """
+    if mode not in ("orfs", "frames"):
+        raise ValueError("mode must be 'orfs' or 'frames'")
+    for name, seq in records:
+        name = name.split()[0] if name.strip() else "seq"
+        frames = six_frames(seq, table)
+        if mode == "frames":
+            for (strand, frame), protein in frames.items():
+                yield f"{name}_frame{strand * (frame + 1):+d}", protein
+            continue
+        orfs = find_orfs(seq, min_length, **orf_options)
+        for i, (orf, protein) in enumerate(zip(orfs, translate_orfs(seq, orfs, table, frames)), 1):
+            strand = "+" if orf["strand"] == 1 else "-"
+            yield f"{name}_orf{i} {orf['start'] + 1}-{orf['end']} strand={strand}", protein
+
+
+def write_protein_fasta(filepath, out_path, mode="orfs", table=1, line_width=60,
+                        buffer_size=1 << 20, progress=None, **options):
+    """Translate a nucleotide FASTA file into a protein FASTA file; returns the protein count.
+
+    Input is read one record at a time and output goes through a write
+    buffer of buffer_size bytes, so memory is bounded by the largest record
+    rather than by the number of proteins. options go to iter_proteins.
+    """
+    records = read_fasta_records(filepath, progress=progress)
+    n = 0
+    with open(out_path, "w", buffering=buffer_size) as f:
+        for header, protein in iter_proteins(records, mode, table, **options):
+            f.write(f">{header}\n")
+            for i in range(0, len(protein), line_width):
+                f.write(protein[i:i + line_width] + "\n")
+            n += 1
+    return n
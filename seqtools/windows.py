@@ -0,0 +1,151 @@
+"""O(n) sliding-window composition from per-symbol cumulative counts."""
+
+import numpy as np
+
+from .encoding import as_text
+
+
+def _as_byte_array(seq):
+    seq = as_text(seq)
+    if isinstance(seq, str):
+        seq = seq.encode("latin-1")
+    return np.frombuffer(seq, dtype=np.uint8)
+
+
+def window_starts(length, window_size, step=1):
+    """0-based start of every full window of window_size, step apart."""
+    if window_size <= 0 or step <= 0:
+        raise ValueError("window_size and step must be positive")
+    return np.arange(0, max(length - window_size + 1, 0), step, dtype=np.int64)
+
+
+def cumulative_counts(data, symbol):
+    """Prefix sums c with c[i] = occurrences of symbol in data[:i] (length n + 1)."""
+    dtype = np.int32 if len(data) < 2 ** 31 else np.int64
+    c = np.zeros(len(data) + 1, dtype=dtype)
+    np.cumsum(data == ord(symbol), out=c[1:])
+    return c
+
+
+def window_sums(values, window_size, step=1):
+    """Return (starts, sums) of a numeric array over every full window."""
+    values = np.asarray(values)
+    starts = window_starts(len(values), window_size, step)
+    c = np.zeros(len(values) + 1, dtype=np.result_type(values.dtype, np.int64))
+    np.cumsum(values, out=c[1:])
+    return starts, c[starts + window_size] - c[starts]
+
+
+def sliding_window_counts(seq, window_size, step=1, alphabet=None, progress=None):
+    """Return (starts, {symbol: int array of counts per window}).
+
+    Each symbol costs one cumulative sum over the sequence, and every
+    window count is c[start + window_size] - c[start], so the total work
+    is O(n * |alphabet|) whatever the window size. alphabet defaults to
+    every symbol present (IUPAC codes and N included).
+    """
+    data = _as_byte_array(seq)
+    if alphabet is None:
+        alphabet = [chr(b) for b in np.flatnonzero(np.bincount(data, minlength=256))]
+    starts = window_starts(len(data), window_size, step)
+    counts = {}
+    for i, symbol in enumerate(alphabet):
+        if progress is not None:
+            progress(i, len(alphabet))
+        c = cumulative_counts(data, symbol)
+        counts[symbol] = c[starts + window_size] - c[starts]
+    return starts, counts
+
+
+def sliding_window_frequencies(seq, window_size, step=1, alphabet=None, progress=None):
+    """Return (starts, {symbol: float array of relative frequencies per window})."""
+    starts, counts = sliding_window_counts(seq, window_size, step, alphabet, progress)
+    return starts, {symbol: c / window_size for symbol, c in counts.items()}
+
+
+class CumulativeProfile:
+    """Per-symbol prefix sums of one sequence, reused for any window size.
+
+    Building costs one pass per symbol and 4 bytes per base per symbol
+    (8 beyond 2**31 bases); every later window query is O(windows).
+    """
+
+    def __init__(self, seq, alphabet=None):
+        data = _as_byte_array(seq)
+        if alphabet is None:
+            alphabet = [chr(b) for b in np.flatnonzero(np.bincount(data, minlength=256))]
+        self.length = len(data)
+        self.alphabet = list(alphabet)
+        self.cumulative = {symbol: cumulative_counts(data, symbol) for symbol in self.alphabet}
+
+    def counts(self, window_size, step=1):
+        """Return (starts, {symbol: counts per window})."""
+        starts = window_starts(self.length, window_size, step)
+        return starts, {
+            symbol: c[starts + window_size] - c[starts] for symbol, c in self.cumulative.items()
+        }
+
+    def frequencies(self, window_size, step=1):
+        starts, counts = self.counts(window_size, step)
+        return starts, {symbol: c / window_size for symbol, c in counts.items()}
+
+
+def _scale_key(scale):
+    return tuple(scale) if isinstance(scale, (tuple, list)) else (scale, 1)
+
+
+def multiscale_counts(seq, scales, alphabet=None):
+    """Window counts at several resolutions from one set of prefix sums.
+
+    scales holds window sizes or (window_size, step) pairs; the result is
+    {(window_size, step): (starts, {symbol: counts})}.
+    """
+    profile = seq if isinstance(seq, CumulativeProfile) else CumulativeProfile(seq, alphabet)
+    return {
+        (window_size, step): profile.counts(window_size, step)
+        for window_size, step in map(_scale_key, scales)
+    }
+
+
+def gc_percent(counts, window_size):
+    """CG% per window from a {symbol: counts} dict."""
+    return 100.0 * (counts.get("G", 0) + counts.get("C", 0)) / window_size
+
+
+def kappa_ic(counts, window_size):
+    """Kappa index of coincidence (%) per window over A, C, G and T."""
+    return 100.0 * sum((counts.get(b, 0) / window_size) ** 2 for b in "ACGT")
+
+
+def write_multiscale_tracks(path, results):
+    """Write multiscale_counts output as one .npz file.
+
+    Each resolution becomes w{size}_s{step} (symbols x windows matrix) and
+    w{size}_s{step}_start; the row order is stored under "alphabet".
+    """
+    arrays = {}
+    alphabet = []
+    for (window_size, step), (starts, counts) in results.items():
+        alphabet = alphabet or list(counts)
+        name = f"w{window_size}_s{step}"
+        arrays[name] = np.array([counts[symbol] for symbol in alphabet]).reshape(len(alphabet), -1)
+        arrays[name + "_start"] = starts
+    arrays["alphabet"] = np.array(alphabet, dtype="U1")
+    np.savez_compressed(path, **arrays)
+
+
+def read_multiscale_tracks(path):
+    """Inverse of write_multiscale_tracks."""
+    results = {}
+    with np.load(path) as data:
+        alphabet = [str(s) for s in data["alphabet"]]
+        for name in data.files:
+            if name == "alphabet" or name.endswith("_start"):
+                continue
+            window_size, step = (int(part[1:]) for part in name.split("_"))
+            matrix = data[name]
+            results[(window_size, step)] = (
+                data[name + "_start"],
+                {symbol: matrix[i] for i, symbol in enumerate(alphabet)},
+            )
+    return results
@@ -0,0 +1,26 @@
+import numpy as np
+
+from seqtools.kmers import kmer_codes
+from seqtools.sketch import CountMinSketch, stream_heavy_hitters
+
+
+def _code(kmer):
+    codes, _ = kmer_codes(kmer, len(kmer))
+    return codes[:1]
+
+
+def test_leading_base_separates_estimates():
+    sketch = CountMinSketch(width=1 << 16, depth=4)
+    sketch.add(np.repeat(_code("A" + "C" * 30), 1000))
+    assert sketch.estimate(_code("A" + "C" * 30))[0] == 1000
+    for base in "CGT":
+        assert sketch.estimate(_code(base + "C" * 30))[0] == 0
+
+
+def test_shared_suffix_kmers_stay_separate():
+    rng = np.random.default_rng(1)
+    suffix = "ACGTTGCAACGTTGCAACGTTGCA"
+    prefixes = {"".join(rng.choice(list("ACGT"), 7)) for _ in range(2000)}
+    reads = [p + suffix for p in sorted(prefixes)[:500]]
+    top, _ = stream_heavy_hitters(reads, 31, top_n=5)
+    assert all(estimate <= 2 for _, estimate, _ in top)